@@ -7,6 +7,7 @@ AWS Lambda: API Gateway -> DynamoDB Ingest (beginner-friendly)
 - Accepts JSON body or plain text; also supports query ?text=...
 - Persists payload into DynamoDB with metadata
 - Returns JSON + CORS headers
+- Reuses one Table object per warm container; bursts go through batch_writer()
 
 Environment:
 - TABLE_NAME: required, DynamoDB table name
@@ -23,7 +24,9 @@ DynamoDB item shape (example when JSON body is an object):
   }
 }
 
-Handler: handler(event, context)
+Handlers:
+- handler(event, context): API Gateway / direct invoke, one PutItem per call
+- handler_batch(event, context): SQS fan-in, records stored via BatchWriteItem
 """
 
 from __future__ import annotations
@@ -32,30 +35,105 @@ import base64
 import json
 import os
 import re
+import time
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
-import boto3
-from botocore.exceptions import ClientError
+# boto3/botocore are imported lazily in _table(): cold starts that fail
+# input validation (or never touch DynamoDB) skip loading the SDK entirely.
 
-# Pre-compiled regex to extract a plausible client IP from headers if present
+try:  # optional fast path: orjson emits compact UTF-8 bytes directly
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    _loads = orjson.loads
+except ImportError:  # stdlib fallback when orjson is not packaged with the function
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    _loads = json.loads  # also accepts bytes (UTF-8/16/32 autodetected)
+
+# Pre-compiled regex used only as a fallback to find an IP inside a header
+# value that is not a bare address (e.g. "for=203.0.113.7")
 RE_IPv4 = re.compile(
     r"\b(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)\b"
 )
 
-ddb = boto3.resource("dynamodb")
+
+# Cached (epoch_second, formatted) pair so warm invocations within the same
+# second skip building a datetime and formatting it again.
+_ts_cache: List[Any] = [-1, ""]
 
 
 def _now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+    s = int(time.time())
+    if s != _ts_cache[0]:
+        _ts_cache[0] = s
+        _ts_cache[1] = datetime.fromtimestamp(s, timezone.utc).isoformat()
+    return _ts_cache[1]
+
+
+# Table bound on first use and reused across warm invocations
+_TABLE: Any = None
+# botocore.exceptions.ClientError once the SDK is loaded. Until then no
+# DynamoDB call has been made, so there is nothing to catch.
+_ClientError: Any = ()
+
+
+# Pre-generated request ids: one 4 KiB os.urandom() read every 256 ids
+_UUID_BATCH = 256
+_UUID_POOL: List[str] = []
+
+
+def _fast_uuid() -> str:
+    """Return a random (version 4) UUID string, same format as uuid4()."""
+    if not _UUID_POOL:
+        buf = os.urandom(16 * _UUID_BATCH)
+        _UUID_POOL.extend(
+            str(uuid.UUID(bytes=buf[i : i + 16], version=4))
+            for i in range(0, len(buf), 16)
+        )
+    return _UUID_POOL.pop()
 
 
 def _table() -> Any:
-    table_name = os.environ.get("TABLE_NAME")
-    if not table_name:
-        raise RuntimeError("TABLE_NAME environment variable is required")
-    return ddb.Table(table_name)
+    global _TABLE, _ClientError
+    if _TABLE is None:
+        table_name = os.environ.get("TABLE_NAME")
+        if not table_name:
+            raise RuntimeError("TABLE_NAME environment variable is required")
+        import boto3
+        from botocore.config import Config
+        from botocore.exceptions import ClientError
+
+        # Keep TLS connections alive across warm invocations and size the
+        # pool so concurrent requests in one container don't queue for one.
+        config = Config(
+            max_pool_connections=64,
+            tcp_keepalive=True,
+            connect_timeout=1,
+            read_timeout=2,
+            retries={"max_attempts": 2, "mode": "standard"},
+        )
+        _ClientError = ClientError
+        _TABLE = boto3.resource("dynamodb", config=config).Table(table_name)
+    return _TABLE
+
+
+def put_many(items: List[Dict[str, Any]]) -> None:
+    """Store many items; batch_writer() groups them 25 per BatchWriteItem.
+
+    Duplicate ids within one batch are collapsed (last one wins) instead of
+    failing the whole request.
+    """
+    with _table().batch_writer(overwrite_by_pkeys=["id"]) as bw:
+        for item in items:
+            bw.put_item(Item=item)
 
 
 def handler(event, context):
@@ -73,64 +151,137 @@ def handler(event, context):
     # Parse from API Gateway
     lines_or_obj, status, err = _parse_apigw_input(event)
     if err:
-        return _response(status, {"error": err})
+        return _response(status, _error_body(err))
 
     # Build a DynamoDB item
     item = _build_item(lines_or_obj, event)
     return _put_and_respond(item)
 
 
+def handler_batch(event, context):
+    """SQS-triggered fan-in: store every record body in one batched write.
+
+    JSON object bodies are stored as 'payload', anything else as 'text'.
+    Returns an SQS partial batch response: records without a string body
+    are listed in batchItemFailures so SQS keeps (and eventually
+    dead-letters) them; this needs ReportBatchItemFailures on the event
+    source mapping. A DynamoDB failure is raised, so the whole batch is
+    retried instead of being deleted.
+    """
+    records = event.get("Records") if isinstance(event, dict) else None
+    if not isinstance(records, list):
+        return _response(400, _error_body("No Records provided"))
+
+    items = []
+    failures: List[Dict[str, str]] = []
+    for record in records:
+        if not isinstance(record, dict) or not isinstance(record.get("body"), str):
+            message_id = record.get("messageId") if isinstance(record, dict) else None
+            if isinstance(message_id, str):
+                failures.append({"itemIdentifier": message_id})
+            continue
+        try:
+            payload_or_text = _loads(record["body"])
+        except ValueError:
+            payload_or_text = record["body"]
+        items.append(_build_item(payload_or_text, record, source="sqs"))
+
+    put_many(items)  # ClientError propagates: Lambda reports the batch as failed
+
+    return {"batchItemFailures": failures}
+
+
+def _is_ipv4(s: str) -> bool:
+    """Strict dotted-quad check without the regex engine.
+
+    Four ASCII-digit octets, each 0-255, no leading zeros.
+    """
+    parts = s.split(".")
+    if len(parts) != 4:
+        return False
+    for p in parts:
+        if not (0 < len(p) <= 3 and p.isascii() and p.isdigit()):
+            return False
+        if (p[0] == "0" and len(p) > 1) or int(p) > 255:
+            return False
+    return True
+
+
 def _client_ip_from_event(event: dict) -> Optional[str]:
-    # Try common places for client IP
-    headers = (
-        (event.get("headers") or {}) if isinstance(event.get("headers"), dict) else {}
-    )
+    # API Gateway fills the caller IP directly: requestContext.identity.sourceIp
+    # (REST API v1) or requestContext.http.sourceIp (HTTP API v2). Plain dict
+    # lookups, so check them before touching any header.
+    rc = event.get("requestContext")
+    if isinstance(rc, dict):
+        for section in ("identity", "http"):
+            src_ip = (rc.get(section) or {}).get("sourceIp")
+            if isinstance(src_ip, str) and _is_ipv4(src_ip):
+                return src_ip
+    # Fallback to proxy headers
+    headers = event.get("headers")
+    if not isinstance(headers, dict):
+        return None
     # X-Forwarded-For may hold comma-separated list, first is client
     for key in ("X-Forwarded-For", "x-forwarded-for", "X-Real-IP", "x-real-ip"):
-        if key in headers and isinstance(headers[key], str):
-            m = RE_IPv4.search(headers[key])
+        value = headers.get(key)
+        if isinstance(value, str):
+            first = value.split(",", 1)[0].strip()
+            if _is_ipv4(first):
+                return first
+            m = RE_IPv4.search(first)
             if m:
                 return m.group(0)
-    # Fallback to requestContext identity
-    rc = event.get("requestContext") or {}
-    identity = rc.get("identity") or {}
-    src_ip = identity.get("sourceIp")
-    if isinstance(src_ip, str) and RE_IPv4.fullmatch(src_ip):
-        return src_ip
     return None
 
 
+def _hget_ci(headers: dict, key: str) -> Any:
+    """Case-insensitive header lookup without rebuilding the headers dict.
+
+    `key` must be lowercase. HTTP API v2 already lowercases header names and
+    REST API v1 usually sends the canonical casing, so try those directly and
+    only scan the remaining keys as a last resort.
+    """
+    if key in headers:
+        return headers[key]
+    canonical = key.title()
+    if canonical in headers:
+        return headers[canonical]
+    for k, v in headers.items():
+        if isinstance(k, str) and k.lower() == key:
+            return v
+    return ""
+
+
 def _parse_apigw_input(event: dict) -> Tuple[Any, int, Optional[str]]:
     """Parse API Gateway input.
     Returns (payload_or_text, status_code, error)
     - If JSON body: returns the parsed JSON (dict/list/etc.)
     - If text body or query ?text=: returns a string
     """
-    headers = event.get("headers") or {}
-    headers_ci = (
-        {str(k).lower(): v for k, v in headers.items()}
-        if isinstance(headers, dict)
-        else {}
-    )
-    ctype = str(headers_ci.get("content-type", ""))
+    headers = event.get("headers")
+    ctype = str(_hget_ci(headers, "content-type")) if isinstance(headers, dict) else ""
 
     body = event.get("body")
     is_b64 = bool(event.get("isBase64Encoded"))
 
     if body is not None:
         if is_b64:
+            # Keep the decoded body as bytes: the JSON parser reads bytes
+            # directly, so only the plain-text branch pays for a str decode.
             try:
-                body = base64.b64decode(body).decode("utf-8", errors="replace")
+                body = base64.b64decode(body)
             except Exception:
                 return None, 400, "Invalid base64 body"
         # JSON body
         if "application/json" in ctype:
             try:
-                data = json.loads(body) if isinstance(body, str) else body
+                data = _loads(body) if isinstance(body, (str, bytes)) else body
             except Exception:
                 return None, 400, "Invalid JSON body"
             return data, 200, None
         # Plain text
+        if isinstance(body, bytes):
+            return body.decode("utf-8", errors="replace"), 200, None
         return str(body), 200, None
 
     # Query string text
@@ -141,7 +292,9 @@ def _parse_apigw_input(event: dict) -> Tuple[Any, int, Optional[str]]:
     return None, 400, "No body or query parameter provided"
 
 
-def _build_item(payload_or_text: Any, event: dict) -> Dict[str, Any]:
+def _build_item(
+    payload_or_text: Any, event: dict, *, source: str = "apigw"
+) -> Dict[str, Any]:
     # Determine id
     provided_id: Optional[str] = None
     if isinstance(payload_or_text, dict):
@@ -150,14 +303,14 @@ def _build_item(payload_or_text: Any, event: dict) -> Dict[str, Any]:
             if isinstance(payload_or_text.get("id"), str)
             else None
         )
-    item_id = provided_id or str(uuid.uuid4())
+    item_id = provided_id or _fast_uuid()
 
     ip = _client_ip_from_event(event)
 
     item: Dict[str, Any] = {
         "id": item_id,
         "meta": {
-            "source": "apigw",
+            "source": source,
             "received_at": _now_iso(),
         },
     }
@@ -174,7 +327,7 @@ def _build_item(payload_or_text: Any, event: dict) -> Dict[str, Any]:
 
 
 def _build_item_from_direct_invoke(event: dict) -> Dict[str, Any]:
-    item_id = event.get("id") if isinstance(event.get("id"), str) else str(uuid.uuid4())
+    item_id = event.get("id") if isinstance(event.get("id"), str) else _fast_uuid()
     item: Dict[str, Any] = {
         "id": item_id,
         "meta": {
@@ -193,20 +346,31 @@ def _put_and_respond(item: Dict[str, Any]) -> dict:
     table = _table()
     try:
         table.put_item(Item=item)
-    except ClientError as e:
+    except _ClientError as e:
         return _response(500, {"error": "dynamodb_put_failed", "detail": str(e)})
 
     return _response(200, {"id": item["id"], "status": "stored"})
 
 
-def _response(status: int, payload: dict) -> dict:
+# Same CORS/content headers on every response. Shared, never mutated.
+_HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "OPTIONS,GET,POST",
+    "Access-Control-Allow-Headers": "Content-Type,Authorization",
+}
+
+
+@lru_cache(maxsize=32)
+def _error_body(message: str) -> str:
+    """Serialized {"error": message}; the set of validation errors is small."""
+    return _dumps({"error": message})
+
+
+def _response(status: int, payload: dict | str) -> dict:
+    """Build an API Gateway response; `payload` may already be a JSON string."""
     return {
         "statusCode": status,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "OPTIONS,GET,POST",
-            "Access-Control-Allow-Headers": "Content-Type,Authorization",
-        },
-        "body": json.dumps(payload),
+        "headers": _HEADERS,
+        "body": payload if isinstance(payload, str) else _dumps(payload),
     }
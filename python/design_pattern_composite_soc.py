@@ -17,6 +17,11 @@ In this file, you have:
 - Leaf Classes: ElasticSink and SplunkSink (individual alert destinations)
 - Composite Class: CompositeSink (can contain multiple sinks)
 - Specialized Composite: FilteredCompositeSink (adds filtering behavior)
+
+For speed, a composite flattens its (static) tree once into a list of leaf
+sinks paired with the combined filter of their ancestors, so sending is a
+single loop rather than a recursive walk. The event is serialized once at
+the composite and the same bytes are handed to every leaf (send_serialized).
 """
 
 # Composite Design Pattern in a DevOps/SOC context
@@ -34,88 +39,186 @@ In this file, you have:
 from __future__ import annotations
 
 import json
-from abc import ABC, abstractmethod
-from typing import Any, Dict, Iterable, List
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+try:  # optional fast path: orjson emits compact UTF-8 bytes directly
+    import orjson
+
+    _dumps = orjson.dumps
+except ImportError:  # stdlib fallback keeps the demo dependency-free
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode(
+            "utf-8"
+        )
+
 
 Event = Dict[str, Any]
 
 
 # Component
-class AlertSink(ABC):
-    @abstractmethod
-    def send(self, event: Event) -> None: ...
+class AlertSink:
+    __slots__ = ()
+
+    def send(self, event: Event) -> None:
+        raise NotImplementedError
+
+    def send_serialized(self, blob: bytes) -> None:
+        """Deliver an already-serialized event (compact JSON bytes).
+
+        Composites serialize once and call this on every leaf. Sinks that can
+        forward the bytes as-is should override it; the default decodes and
+        falls back to send().
+        """
+        self.send(json.loads(blob))
 
 
 # Leaf 1
 class ElasticSink(AlertSink):
+    __slots__ = ("endpoint", "token")
+
     def __init__(self, endpoint: str, token: str) -> None:
         self.endpoint = endpoint
         self.token = token
 
     def send(self, event: Event) -> None:
-        payload = json.dumps(event, separators=(",", ":"))
-        print(f"[Elastic] POST {self.endpoint} auth=*** body={payload}")
+        self.send_serialized(_dumps(event))
+
+    def send_serialized(self, blob: bytes) -> None:
+        print(f"[Elastic] POST {self.endpoint} auth=*** body={blob.decode()}")
 
 
 # Leaf 2
 class SplunkSink(AlertSink):
+    __slots__ = ("hec_url", "hec_token")
+
     def __init__(self, hec_url: str, hec_token: str) -> None:
         self.hec_url = hec_url
         self.hec_token = hec_token
 
     def send(self, event: Event) -> None:
-        payload = json.dumps(event, separators=(",", ":"))
-        print(f"[Splunk] POST {self.hec_url} auth=*** body={payload}")
+        self.send_serialized(_dumps(event))
+
+    def send_serialized(self, blob: bytes) -> None:
+        print(f"[Splunk] POST {self.hec_url} auth=*** body={blob.decode()}")
+
+
+# Per-leaf routing test built from the filters on the path to that leaf
+Predicate = Callable[[Event], bool]
 
 
 # Composite: can contain children that are either leaves or other composites
 class CompositeSink(AlertSink):
+    """Group of sinks. On first send the subtree is flattened into a list of
+    (leaf, predicate) pairs, so an event costs one loop over the leaves
+    instead of a recursive walk. Each group keeps a reference to the groups
+    that contain it, so add()/remove() anywhere in the tree also invalidate
+    the flattened view of every group above it.
+    """
+
+    __slots__ = ("name", "_children", "_flat", "_parents")
+
     def __init__(
         self, name: str = "group", children: Iterable[AlertSink] | None = None
     ) -> None:
         self.name = name
-        self._children: List[AlertSink] = list(children or [])
+        self._children: List[AlertSink] = []
+        self._flat: List[Tuple[AlertSink, Predicate | None]] | None = None
+        # Groups this one is a child of (a group may sit in several)
+        self._parents: List[CompositeSink] = []
+        for child in children or ():
+            self.add(child)
 
     def add(self, child: AlertSink) -> None:
         self._children.append(child)
+        if isinstance(child, CompositeSink):
+            child._parents.append(self)
+        self._invalidate()
 
     def remove(self, child: AlertSink) -> None:
         self._children.remove(child)
+        if isinstance(child, CompositeSink):
+            child._parents.remove(self)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Drop the flattened view here and in every group above."""
+        self._flat = None
+        for parent in self._parents:
+            parent._invalidate()
+
+    def compile(self) -> None:
+        """Flatten the tree below this node into (leaf, predicate) pairs."""
+        flat: List[Tuple[AlertSink, Predicate | None]] = []
+        self._collect(flat, None)
+        self._flat = flat
+
+    def _predicate(self, parent: Predicate | None) -> Predicate | None:
+        # Plain groups don't filter: children inherit the parent's predicate
+        return parent
+
+    def _collect(
+        self, out: List[Tuple[AlertSink, Predicate | None]], parent: Predicate | None
+    ) -> None:
+        pred = self._predicate(parent)
+        for c in self._children:
+            if isinstance(c, CompositeSink):
+                c._collect(out, pred)
+            else:
+                out.append((c, pred))
 
     def send(self, event: Event) -> None:
-        print(f"[Composite:{self.name}] Fan-out to {len(self._children)} child(ren)")
-        for c in self._children:
-            c.send(event)
+        if self._flat is None:
+            self.compile()
+        flat = self._flat
+        print(f"[Composite:{self.name}] Fan-out to {len(flat)} leaf sink(s)")
+        blob = _dumps(event)  # serialize once, every leaf gets the same bytes
+        for leaf, pred in flat:
+            if pred is None or pred(event):
+                leaf.send_serialized(blob)
 
 
 # Optional: a composite that only forwards specific severities/kinds
 class FilteredCompositeSink(CompositeSink):
+    __slots__ = ("allowed_severities", "allowed_kinds")
+
     def __init__(
         self,
         name: str,
-        allowed_severities: set[str] | None = None,
-        allowed_kinds: set[str] | None = None,
+        allowed_severities: Iterable[str] | None = None,
+        allowed_kinds: Iterable[str] | None = None,
         children: Iterable[AlertSink] | None = None,
     ) -> None:
         super().__init__(name=name, children=children)
-        self.allowed_severities = allowed_severities
-        self.allowed_kinds = allowed_kinds
-
-    def send(self, event: Event) -> None:
-        sev_ok = (self.allowed_severities is None) or (
-            event.get("severity") in self.allowed_severities
+        self.allowed_severities = (
+            frozenset(allowed_severities) if allowed_severities is not None else None
         )
-        kind_ok = (self.allowed_kinds is None) or (
-            event.get("kind") in self.allowed_kinds
+        self.allowed_kinds = (
+            frozenset(allowed_kinds) if allowed_kinds is not None else None
         )
-        if not (sev_ok and kind_ok):
-            print(f"[Composite:{self.name}] Dropped by filter: {event.get('message')}")
-            return
-        super().send(event)
+
+    def _predicate(self, parent: Predicate | None) -> Predicate | None:
+        if self.allowed_severities is None and self.allowed_kinds is None:
+            return parent
+        # Bound frozenset.__contains__: C-level membership test per event
+        sevs, kinds = self.allowed_severities, self.allowed_kinds
+        sev_ok = sevs.__contains__ if sevs is not None else None
+        kind_ok = kinds.__contains__ if kinds is not None else None
+
+        def allowed(event: Event) -> bool:
+            if parent is not None and not parent(event):
+                return False
+            if sev_ok is not None and not sev_ok(event.get("severity")):
+                return False
+            return kind_ok is None or kind_ok(event.get("kind"))
+
+        return allowed
 
 
 # Producers (client code) depend only on the AlertSink interface
 class AuthMonitor:
+    __slots__ = ("sink",)
+
     def __init__(self, sink: AlertSink) -> None:
         self.sink = sink
 
@@ -131,6 +234,8 @@ class AuthMonitor:
 
 
 class FirewallMonitor:
+    __slots__ = ("sink",)
+
     def __init__(self, sink: AlertSink) -> None:
         self.sink = sink
 
@@ -164,8 +269,9 @@ if __name__ == "__main__":
         name="oncall-high", allowed_severities={"high"}, children=[splunk]
     )
 
-    # Root group that fans out to all
+    # Root group that fans out to all; flatten once now that the tree is built
     root = CompositeSink(name="root", children=[region_eu, region_us, oncall_high])
+    root.compile()
 
     # Client code (producers) use the root sink uniformly
     auth = AuthMonitor(root)
@@ -38,20 +38,38 @@ In this file, we implement an audit logging system:
 # - Reusable: apply the same audit logic to any function
 # - Non-intrusive: no changes needed to existing function implementations
 
-from typing import Callable, Any, TypeVar
+from typing import Callable, Any, Dict, List, TypeVar
 from functools import wraps
+import asyncio
+import atexit
+import inspect
+import threading
 import time
+from time import perf_counter_ns
 import json
 import os
 from pathlib import Path
 
+try:  # optional: orjson returns the bytes the JSONL writer buffers as-is
+    import orjson
+
+    _dumps = orjson.dumps
+except ImportError:  # stdlib fallback keeps the demo dependency-free
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode(
+            "utf-8"
+        )
+
+
 """
 MAIN GOAL: SOC/DevOps-focused decorator for audit logging.
 
 This file shows:
 - Creating a reusable audit decorator for security events
 - Using @wraps to preserve function metadata
-- Writing compact JSONL audit entries with duration and status
+- Writing compact JSONL audit entries with duration and status, buffered
+  through one long-lived writer per log file
 - Minimal demo with two monitors (auth, firewall)
 """
 
@@ -59,49 +77,213 @@ This file shows:
 F = TypeVar("F", bound=Callable[..., Any])
 
 
-def audit_event(func: F) -> F:
+# Audited calls usually come in bursts; all calls within one second share
+# the "ts" string built for the first of them: [epoch_second, formatted].
+_ts_cache: List[Any] = [-1, ""]
+
+
+def _iso_now() -> str:
+    """Return the ``ts`` value for an audit entry (UTC, second precision)."""
+    s = int(time.time())
+    if s != _ts_cache[0]:
+        _ts_cache[0] = s
+        _ts_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(s))
+    return _ts_cache[1]
+
+
+class _JsonlWriter:
+    """Long-lived JSONL appender whose disk I/O runs on one flusher thread.
+
+    write() only appends to an in-memory list under a short lock, so callers
+    (including coroutines on the event loop) never wait on disk I/O. A daemon
+    flusher thread writes pending lines with a single os.write() per batch
+    on a descriptor opened once with O_APPEND: as soon as `batch_size` lines
+    are pending, or every `flush_interval` seconds. Pending lines are
+    flushed at exit.
+    """
+
+    def __init__(
+        self, path: str, batch_size: int = 256, flush_interval: float = 0.5
+    ) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._fd: int | None = os.open(
+            path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+        )
+        self._pending: List[bytes] = []
+        self._lock = threading.Lock()  # guards _pending only, never held for I/O
+        self._io_lock = threading.Lock()  # serializes os.write() and close
+        self._wake = threading.Event()  # a full batch is waiting
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="audit-jsonl-flush", daemon=True
+        )
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def write(self, line: bytes) -> None:
+        """Queue one serialized event (without trailing newline)."""
+        with self._lock:
+            self._pending.append(line)
+            n = len(self._pending)
+        if n == self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> None:
+        """Write every pending line now, on the calling thread."""
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch or self._fd is None:
+                return
+            batch.append(b"")  # trailing newline after the last line
+            view = memoryview(b"\n".join(batch))
+            while view:  # os.write may be partial for very large batches
+                view = view[os.write(self._fd, view) :]
+
+    def close(self) -> None:
+        self._closed.set()
+        self._wake.set()
+        self._flusher.join()
+        self.flush()
+        with self._io_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def _flush_loop(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+_writers: Dict[str, _JsonlWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _get_writer(path: str) -> _JsonlWriter:
+    """Return the shared writer for `path`, opening it on first use."""
+    writer = _writers.get(path)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(path)
+            if writer is None:
+                writer = _writers[path] = _JsonlWriter(path)
+    return writer
+
+
+# Keyword arguments copied into each audit entry when present
+AUDIT_FIELDS = ("kind", "severity", "username", "ip", "src_ip", "dst_ip", "message")
+
+
+def _audit_fields_for(func: Callable[..., Any]) -> tuple[str, ...]:
+    """Return the subset of AUDIT_FIELDS that `func` can receive as kwargs.
+
+    Functions taking **kwargs may receive any field; otherwise only fields
+    declared as keyword-capable parameters are worth checking per call.
+    """
+    try:
+        params = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return AUDIT_FIELDS
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()):
+        return AUDIT_FIELDS
+    return tuple(
+        k
+        for k in AUDIT_FIELDS
+        if k in params and params[k].kind is not inspect.Parameter.POSITIONAL_ONLY
+    )
+
+
+def audit_event(func: F | None = None, *, catch: bool = True) -> Any:
     """Audit decorator: logs security-relevant fields to a JSONL file.
 
     Records: timestamp, function name, status (ok/error), duration_ms and any
     of these fields if present in kwargs: kind, severity, username, ip, src_ip,
     dst_ip, message.
+
+    Everything constant per decorated function (its name, the audit fields it
+    can receive, the log path) is resolved once here, not on every call.
+    Works on both plain and ``async def`` functions; in either case the log
+    line only joins the writer's in-memory batch and the file write happens
+    on the writer's flusher thread, so the caller (or the event loop) never
+    waits on disk I/O.
+
+    Use as ``@audit_event`` or ``@audit_event(catch=False)``. With catch=False
+    the wrapper has no exception handler at all: only successful calls are
+    logged and errors propagate untouched (for hot, non-failing paths).
     """
+    if func is None:
+        return lambda f: audit_event(f, catch=catch)
+
+    name = func.__name__
+    fields = _audit_fields_for(func)
+    log_path = os.getenv("SOC_AUDIT_LOG", "soc_audit_log.jsonl")
+
+    def log(status: str, start: int, kwargs: Dict[str, Any]) -> None:
+        event = {
+            "ts": _iso_now(),
+            "func": name,
+            "status": status,
+            "duration_ms": (perf_counter_ns() - start) // 1_000_000,
+        }
+        if kwargs:
+            for k in fields:
+                if k in kwargs:
+                    event[k] = kwargs[k]
+        # In-memory append; the flusher thread writes once per batch
+        _get_writer(log_path).write(_dumps(event))
+
+    if inspect.iscoroutinefunction(func):
+        if not catch:
+
+            @wraps(func)
+            async def async_wrapper_notrap(*args: Any, **kwargs: Any) -> Any:
+                start = perf_counter_ns()
+                result = await func(*args, **kwargs)
+                log("ok", start, kwargs)
+                return result
+
+            return async_wrapper_notrap
+
+        @wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter_ns()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception:
+                log("error", start, kwargs)
+                raise
+            log("ok", start, kwargs)
+            return result
+
+        return async_wrapper
+
+    if not catch:
+
+        @wraps(func)
+        def wrapper_notrap(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter_ns()
+            result = func(*args, **kwargs)
+            log("ok", start, kwargs)
+            return result
+
+        return wrapper_notrap
 
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
-        start = time.time()
-        status = "ok"
-        result: Any = None
+        start = perf_counter_ns()
         try:
             result = func(*args, **kwargs)
-            return result
         except Exception:
-            status = "error"
+            log("error", start, kwargs)
             raise
-        finally:
-            duration_ms = int((time.time() - start) * 1000)
-            event = {
-                "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                "func": func.__name__,
-                "status": status,
-                "duration_ms": duration_ms,
-            }
-            for k in (
-                "kind",
-                "severity",
-                "username",
-                "ip",
-                "src_ip",
-                "dst_ip",
-                "message",
-            ):
-                if k in kwargs:
-                    event[k] = kwargs[k]
-            log_path = os.getenv("SOC_AUDIT_LOG", "soc_audit_log.jsonl")
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(event, separators=(",", ":")) + "\n")
+        log("ok", start, kwargs)
+        return result
 
-    return wrapper  # type: ignore
+    return wrapper
 
 
 @audit_event
@@ -120,6 +302,13 @@ def record_port_scan(src_ip: str, dst_ip: str, **audit: Any) -> None:
     print(f"[Firewall] Port scan {src_ip} -> {dst_ip}")
 
 
+@audit_event
+async def lookup_threat_intel(ip: str, **audit: Any) -> bool:
+    """Simulate an async threat-intel lookup; audited without blocking the loop."""
+    await asyncio.sleep(0)
+    return ip.startswith("203.0.113.")
+
+
 # Simple audited file operations (module-level)
 @audit_event
 def append_line(file: str | Path, line: str, **audit: Any) -> None:
@@ -160,6 +349,15 @@ if __name__ == "__main__":
         severity="high",
         message="Port scan detected",
     )
+    flagged = asyncio.run(
+        lookup_threat_intel(
+            ip="203.0.113.25",
+            kind="intel",
+            severity="low",
+            message="Threat intel lookup",
+        )
+    )
+    print(f"[Intel] 203.0.113.25 flagged={flagged}")
     # ---- Simple file log example (append and read) ----
     log_file = Path("demo_app.log")
     append_line(
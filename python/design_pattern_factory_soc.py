@@ -44,18 +44,21 @@ from __future__ import annotations
 
 import os
 import json
-from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
 
 # Product interface
-class EventSender(ABC):
-    @abstractmethod
-    def send(self, event: Dict[str, Any]) -> None: ...
+class EventSender:
+    __slots__ = ()
+
+    def send(self, event: Dict[str, Any]) -> None:
+        raise NotImplementedError
 
 
 # Concrete Product: Elastic
 class ElasticSender(EventSender):
+    __slots__ = ("endpoint", "token")
+
     def __init__(self, endpoint: str, token: str) -> None:
         self.endpoint = endpoint
         self.token = token
@@ -69,6 +72,8 @@ class ElasticSender(EventSender):
 
 # Concrete Product: Splunk
 class SplunkSender(EventSender):
+    __slots__ = ("hec_url", "hec_token")
+
     def __init__(self, hec_url: str, hec_token: str) -> None:
         self.hec_url = hec_url
         self.hec_token = hec_token
@@ -82,11 +87,30 @@ class SplunkSender(EventSender):
 # Concrete Product: Stdout (fallback / local dev)
 
 
+# Builders: each reads its own config/env defaults and returns a sender
+def _build_elastic(config: Dict[str, Any]) -> EventSender:
+    endpoint = config.get("endpoint") or os.getenv(
+        "ELASTIC_ENDPOINT", "https://elastic.example/_bulk"
+    )
+    token = config.get("token") or os.getenv("ELASTIC_TOKEN", "demo-token")
+    return ElasticSender(endpoint, token)
+
+
+def _build_splunk(config: Dict[str, Any]) -> EventSender:
+    hec_url = config.get("hec_url") or os.getenv(
+        "SPLUNK_HEC_URL", "https://splunk.example:8088/services/collector"
+    )
+    hec_token = config.get("hec_token") or os.getenv(
+        "SPLUNK_HEC_TOKEN", "demo-hec-token"
+    )
+    return SplunkSender(hec_url, hec_token)
+
+
 # Simple Factory
 class EventSenderFactory:
-    _registry = {
-        "elastic": ElasticSender,
-        "splunk": SplunkSender,
+    _registry: Dict[str, Callable[[Dict[str, Any]], EventSender]] = {
+        "elastic": _build_elastic,
+        "splunk": _build_splunk,
     }
 
     @staticmethod
@@ -94,36 +118,24 @@ class EventSenderFactory:
         """Create an EventSender for a given vendor.
 
         If vendor is None, read SIEM_VENDOR from env. No default fallback.
+        Each call returns a new sender and reads the env defaults again, so
+        a rotated token or endpoint is picked up by the next create().
         """
-        key_env = os.getenv("SIEM_VENDOR")
-        key_source = vendor if vendor is not None else key_env
+        key_source = vendor if vendor is not None else os.getenv("SIEM_VENDOR")
         if not key_source:
             raise ValueError(
                 "SIEM vendor not specified. Set SIEM_VENDOR or pass vendor explicitly (elastic|splunk)."
             )
-        key = key_source.strip().lower()
-
-        if key == "elastic":
-            endpoint = config.get("endpoint") or os.getenv(
-                "ELASTIC_ENDPOINT", "https://elastic.example/_bulk"
-            )
-            token = config.get("token") or os.getenv("ELASTIC_TOKEN", "demo-token")
-            return ElasticSender(endpoint, token)
-
-        if key == "splunk":
-            hec_url = config.get("hec_url") or os.getenv(
-                "SPLUNK_HEC_URL", "https://splunk.example:8088/services/collector"
-            )
-            hec_token = config.get("hec_token") or os.getenv(
-                "SPLUNK_HEC_TOKEN", "demo-hec-token"
-            )
-            return SplunkSender(hec_url, hec_token)
-
-        raise ValueError(f"Unknown SIEM vendor: {vendor!r}")
+        build = EventSenderFactory._registry.get(key_source.strip().lower())
+        if build is None:
+            raise ValueError(f"Unknown SIEM vendor: {vendor!r}")
+        return build(config)
 
 
 # Example SOC producers that depend only on EventSender
 class AuthMonitor:
+    __slots__ = ("sender",)
+
     def __init__(self, sender: EventSender) -> None:
         self.sender = sender
 
@@ -139,6 +151,8 @@ class AuthMonitor:
 
 
 class FirewallMonitor:
+    __slots__ = ("sender",)
+
     def __init__(self, sender: EventSender) -> None:
         self.sender = sender
 
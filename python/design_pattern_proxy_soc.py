@@ -24,7 +24,7 @@ Real-World Example from This Code
 In this file, we implement a SIEM (Security Information and Event Management) sender proxy:
 - Subject: AlertSender interface
 - RealSubject: RealSIEMSender that sends alerts to a SIEM
-- Proxy: SIEMSenderProxy that adds authentication, rate limiting, and lazy initialization
+- Proxy: SIEMSenderProxy that adds authentication, rate limiting (token bucket), and lazy initialization
 """
 
 # Proxy Design Pattern in a DevOps/SOC context (Protection + Virtual Proxy)
@@ -42,6 +42,18 @@ import json
 from abc import ABC, abstractmethod
 from typing import Any, Dict
 
+try:  # optional fast path: orjson is a native encoder, several times faster
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+except ImportError:  # stdlib fallback keeps the demo dependency-free
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+
 # Simple alias to make type hints shorter and clearer in this example
 Event = Dict[str, Any]
 
@@ -53,6 +65,14 @@ class AlertSender(ABC):
     @abstractmethod
     def send(self, event: Event) -> None: ...
 
+    def send_raw(self, body: str) -> None:
+        """Deliver an event that is already serialized as compact JSON.
+
+        Senders that forward the body as-is should override this; the default
+        parses it back and falls back to send().
+        """
+        self.send(json.loads(body))
+
 
 # RealSubject: connects to SIEM (Elastic, Splunk, etc.)
 class RealSIEMSender(AlertSender):
@@ -70,18 +90,26 @@ class RealSIEMSender(AlertSender):
         print("[RealSIEMSender] Ready")
 
     def send(self, event: Event) -> None:
+        self.send_raw(_dumps(event))
+
+    def send_raw(self, body: str) -> None:
         # In real life: HTTP POST with retries/backoff
-        payload = json.dumps(event, separators=(",", ":"))
-        print(f"[SIEM] POST {self.endpoint} auth=*** body={payload}")
+        print(f"[SIEM] POST {self.endpoint} auth=*** body={body}")
 
 
 # Proxy: validates auth, rate-limits, and lazily creates RealSIEMSender on first use
 class SIEMSenderProxy(AlertSender):
     """Protection + virtual proxy for a SIEM sender.
 
-    - Enforces presence of an auth token (basic access control).
-    - Applies a naive fixed-window rate limit.
+    - Enforces presence of an auth token (basic access control), checked
+      once at construction.
+    - Applies a token-bucket rate limit (as GCRA): up to `capacity` events in
+      a burst, refilled continuously at `refill_rate` events per second.
     - Lazily creates the real sender on first use to avoid upfront cost.
+
+    The auth token is checked once at construction. Once the real sender
+    exists, _bind() points send/send_raw at _send_direct/_send_raw_direct,
+    which skip the lazy-init check.
     """
 
     def __init__(
@@ -89,6 +117,9 @@ class SIEMSenderProxy(AlertSender):
         endpoint: str | None = None,
         token: str | None = None,
         rate_limit_per_sec: int = 5,
+        *,
+        capacity: int | None = None,
+        refill_rate: float | None = None,
     ) -> None:
         # Resolve configuration with sensible fallbacks for the demo
         self.endpoint = endpoint or os.getenv(
@@ -99,8 +130,34 @@ class SIEMSenderProxy(AlertSender):
         # Internal state
         self._real: RealSIEMSender | None = None
         self.rate_limit_per_sec = rate_limit_per_sec
-        self._last_window_start = time.time()
-        self._count_in_window = 0
+        self.capacity = capacity if capacity is not None else rate_limit_per_sec
+        self.refill_rate = (
+            refill_rate if refill_rate is not None else float(rate_limit_per_sec)
+        )
+        # GCRA, the token bucket expressed as one timestamp: `_tat` is the
+        # theoretical arrival time (monotonic ns) of the next conforming
+        # event. Each admitted event pushes it `_ns_per_token` further out;
+        # an event is admitted while that lies at most `_burst_ns` ahead, which
+        # allows `capacity` back-to-back events from idle.
+        if self.refill_rate <= 0 or self.capacity <= 0:
+            # rate 0 means "deny all": no event can ever lie within the burst
+            self._ns_per_token = 0
+            self._burst_ns = -1
+        else:
+            self._ns_per_token = max(1, round(1_000_000_000 / self.refill_rate))
+            self._burst_ns = (self.capacity - 1) * self._ns_per_token
+        self._tat = 0  # in the past: start with the full burst available
+
+        # Access control, fail-fast: the hot path never re-checks the token
+        if not self.token:
+            raise PermissionError("Unauthorized: SIEM token not configured")
+        self._bind()
+
+    def _bind(self) -> None:
+        """Switch this instance to the direct send methods once the real sender exists."""
+        if self._real is not None:
+            self.send = self._send_direct  # type: ignore[method-assign]
+            self.send_raw = self._send_raw_direct  # type: ignore[method-assign]
 
     def _ensure_real(self) -> None:
         if self._real is None:
@@ -111,58 +168,78 @@ class SIEMSenderProxy(AlertSender):
             self._real = RealSIEMSender(self.endpoint, self.token)
 
     def _allow(self) -> bool:
-        # Simple fixed-window rate limit
-        now = time.time()
-        if now - self._last_window_start >= 1.0:
-            self._last_window_start = now
-            self._count_in_window = 0
-        if self._count_in_window < self.rate_limit_per_sec:
-            self._count_in_window += 1
-            return True
-        return False
+        now = time.monotonic_ns()
+        tat = self._tat
+        if tat < now:
+            tat = now
+        if tat - now > self._burst_ns:
+            return False
+        self._tat = tat + self._ns_per_token
+        return True
 
     def send(self, event: Event) -> None:
-        # Access control
-        if not self.token:
-            raise PermissionError("Unauthorized: SIEM token not configured")
         # Rate limiting
         if not self._allow():
             print("[Proxy] Rate limit exceeded, dropping event:", event.get("message"))
             return
-        # Lazy creation of the real sender
+        # Lazy creation of the real sender; later calls skip this check
         self._ensure_real()
+        self._bind()
         self._real.send(event)  # type: ignore[union-attr]
 
+    def send_raw(self, body: str) -> None:
+        # Same checks as send(); the pre-serialized body is passed through
+        if not self._allow():
+            print("[Proxy] Rate limit exceeded, dropping event:", body)
+            return
+        self._ensure_real()
+        self._bind()
+        self._real.send_raw(body)  # type: ignore[union-attr]
+
+    def _send_direct(self, event: Event) -> None:
+        if self._allow():
+            self._real.send(event)  # type: ignore[union-attr]
+        else:
+            print("[Proxy] Rate limit exceeded, dropping event:", event.get("message"))
+
+    def _send_raw_direct(self, body: str) -> None:
+        if self._allow():
+            self._real.send_raw(body)  # type: ignore[union-attr]
+        else:
+            print("[Proxy] Rate limit exceeded, dropping event:", body)
+
 
 # Client code uses the proxy as if it were the real sender
+# The event schema is fixed, so monitors fill a pre-serialized JSON template:
+# only the variable values go through json.dumps (for correct escaping).
 class AuthMonitor:
+    _AUTH_TMPL = (
+        '{{"kind":"auth","severity":"medium","message":"Failed login detected",'
+        '"username":{u},"ip":{i}}}'
+    )
+
     def __init__(self, sender: AlertSender) -> None:
         self.sender = sender
 
     def record_failed_login(self, username: str, ip: str) -> None:
-        event = {
-            "kind": "auth",
-            "severity": "medium",
-            "message": "Failed login detected",
-            "username": username,
-            "ip": ip,
-        }
-        self.sender.send(event)
+        self.sender.send_raw(
+            self._AUTH_TMPL.format(u=json.dumps(username), i=json.dumps(ip))
+        )
 
 
 class FirewallMonitor:
+    _SCAN_TMPL = (
+        '{{"kind":"network","severity":"high","message":"Port scan detected",'
+        '"src_ip":{s},"dst_ip":{d}}}'
+    )
+
     def __init__(self, sender: AlertSender) -> None:
         self.sender = sender
 
     def record_port_scan(self, src_ip: str, dst_ip: str) -> None:
-        event = {
-            "kind": "network",
-            "severity": "high",
-            "message": "Port scan detected",
-            "src_ip": src_ip,
-            "dst_ip": dst_ip,
-        }
-        self.sender.send(event)
+        self.sender.send_raw(
+            self._SCAN_TMPL.format(s=json.dumps(src_ip), d=json.dumps(dst_ip))
+        )
 
 
 if __name__ == "__main__":
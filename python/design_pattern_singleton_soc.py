@@ -29,54 +29,206 @@ We implement a Singleton SIEM (Security Information and Event Management) client
 #
 # Goal: Ensure only one configured client exists to send security events to a SIEM
 # (e.g., Elastic, Splunk, Chronicle). Centralizing avoids duplicated connections,
-# inconsistent configs, and enables shared features like buffering or rate-limits.
+# inconsistent configs, and enables shared features like buffering or rate-limits
+# (here: one background thread batching events into fewer SIEM requests).
 
 from __future__ import annotations
 
+import atexit
+import collections
 import os
 import json
+import queue
+import sys
+import threading
 import time
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+try:  # optional: orjson serializes each flushed batch much faster
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+except ImportError:  # the demo still runs with only the standard library
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+
+# send_event() stamps every event it queues; the string is rebuilt only
+# when the epoch second changes: [epoch_second, formatted].
+_ts_cache: List[Any] = [-1, ""]
+
+
+def _iso_now() -> str:
+    """Return the SIEM event timestamp, e.g. "2025-01-01T00:00:00Z"."""
+    s = int(time.time())
+    if s != _ts_cache[0]:
+        _ts_cache[0] = s
+        _ts_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(s))
+    return _ts_cache[1]
 
 
 class SIEMClient:
     """Singleton SIEM client using a classmethod accessor.
 
-    - Access via SIEMClient.get_instance() to ensure a single instance.
+    - Access via SIEMClient.get_instance() to ensure a single instance; safe
+      to call from several threads at once.
     - Reads configuration once from env variables.
     - Provides send_event() to standardize event format.
+    - Batches events: send_event() only enqueues; a background thread POSTs
+      up to `batch_size` events per request as a JSON array, at least every
+      `flush_interval` seconds. When the queue is full the oldest event is
+      dropped so callers never block. A batch that fails to POST is logged
+      to stderr and dropped. Queued events are flushed at exit, waiting at
+      most `close_timeout` seconds.
+    - `buffer` keeps the last `buffer_size` delivered events (for the demo);
+      older ones are discarded, so memory stays bounded.
     """
 
     _instance: "SIEMClient | None" = None
+    _lock = threading.Lock()
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_queue: int = 10_000,
+        close_timeout: float = 5.0,
+        buffer_size: int = 1_000,
+    ) -> None:
         if getattr(self, "_initialized", False):
             return
         # Load config once
         self.endpoint = os.getenv("SIEM_ENDPOINT", "https://siem.example/api/events")
         self.token = os.getenv("SIEM_TOKEN", "demo-token")
         self.source = os.getenv("SIEM_SOURCE", "SOC-Python-Agent")
-        self.buffer: list[Dict[str, Any]] = []  # naive buffer for demo
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.close_timeout = close_timeout
+        self.buffer: "collections.deque[Dict[str, Any]]" = collections.deque(
+            maxlen=buffer_size
+        )
+        self.sent_count = 0
+        self.dropped_count = 0
+        self.failed_count = 0
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="siem-flush", daemon=True
+        )
+        self._flusher.start()
+        atexit.register(self.close)  # daemon thread: drain it before exit
         self._initialized = True
 
-    @staticmethod
-    def get_instance() -> "SIEMClient":
-        if SIEMClient._instance is None:
-            SIEMClient._instance = SIEMClient()
-        return SIEMClient._instance
+    @classmethod
+    def get_instance(cls) -> "SIEMClient":
+        # Double-checked locking: the lock is only taken until the instance
+        # exists, so concurrent first calls still build exactly one client.
+        inst = cls._instance
+        if inst is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                inst = cls._instance
+        return inst
 
     def send_event(self, kind: str, severity: str, message: str, **extra: Any) -> None:
         event = {
-            "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "ts": _iso_now(),
             "source": self.source,
             "kind": kind,  # e.g., auth, network, system, vuln
             "severity": severity,  # info, low, medium, high, critical
             "message": message,
             "extra": extra,
         }
-        # In real life: HTTP POST with retries/backoff. Here we print and buffer.
-        print(f"[SIEM] POST {self.endpoint} auth=*** body={json.dumps(event)}")
-        self.buffer.append(event)
+        if self._closed.is_set():
+            raise RuntimeError("SIEMClient is closed; event not sent")
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Drop-oldest: keep the most recent events under sustained overload
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+            except queue.Empty:
+                pass
+            self.dropped_count += 1
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:  # lost a race with another producer
+                pass
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued event has been handled by the flusher.
+
+        Waits at most `timeout` seconds (default: `close_timeout`) and
+        returns False if events were still pending by then.
+        """
+        q = self._queue
+        deadline = time.monotonic() + (
+            self.close_timeout if timeout is None else timeout
+        )
+        with q.all_tasks_done:
+            while q.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                q.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        """Flush pending events and stop the background thread (idempotent).
+
+        Later send_event() calls raise RuntimeError.
+        """
+        self._closed.set()
+        if not self.flush():
+            print(
+                f"[SIEM] close: {self._queue.qsize()} events still queued, giving up",
+                file=sys.stderr,
+            )
+        self._flusher.join(self.close_timeout)
+        atexit.unregister(self.close)
+
+    def _post(self, batch: List[Dict[str, Any]]) -> None:
+        # In real life: one HTTP POST with retries/backoff. Here we print.
+        print(
+            f"[SIEM] POST {self.endpoint} auth=*** events={len(batch)} "
+            f"body={_dumps(batch)}"
+        )
+        self.buffer.extend(batch)
+        self.sent_count += len(batch)
+
+    def _flush_loop(self) -> None:
+        q = self._queue
+        while not (self._closed.is_set() and q.empty()):
+            try:
+                batch = [q.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            # Collect more events until the batch is full or the interval ends
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._post(batch)
+            except Exception as e:  # keep the flusher alive for later batches
+                self.failed_count += len(batch)
+                print(
+                    f"[SIEM] dropped {len(batch)} events: {e.__class__.__name__}: {e}",
+                    file=sys.stderr,
+                )
+            finally:
+                for _ in batch:
+                    q.task_done()
 
 
 # Example SOC utilities that all reuse the same SIEMClient instance
@@ -117,7 +269,9 @@ if __name__ == "__main__":
     fw.record_port_scan(src_ip="198.51.100.10", dst_ip="10.0.0.5")
 
     client = SIEMClient.get_instance()
-    print("\nSingleton check: buffer length:", len(client.buffer))
+    client.flush()
+    print("\nSingleton check: same instance:", client is auth.siem is fw.siem)
+    print("Events delivered in batches:", client.sent_count)
     print("All events (buffered):")
     for e in client.buffer:
         print(" -", e["kind"], e["message"])
@@ -17,16 +17,33 @@ Examples:
 from __future__ import annotations
 
 import argparse
+import mmap
 import re
 import sys
+from collections import Counter
 from pathlib import Path
-from typing import Iterator, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 # Simple regex patterns
-RE_IPv4 = re.compile(r"\b(?:(?:25[0-5]|2[0-4]\\d|1?\\d?\\d)\\.){3}(?:25[0-5]|2[0-4]\\d|1?\\d?\\d)\\b")
-RE_EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Za-z]{2,}")
-RE_FR_PHONE = re.compile(r"\b(?:\\+33\\s?[1-9](?:[ .-]?\\d{2}){4}|0[1-9](?:[ .-]?\\d{2}){4})\\b")
-RE_LOG_LEVEL = re.compile(r"\\b(DEBUG|INFO|WARN|WARNING|ERROR|CRITICAL|FATAL)\\b", re.IGNORECASE)
+RE_IPv4 = re.compile(r"\b(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)\b")
+RE_EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+RE_FR_PHONE = re.compile(r"\b(?:\+33\s?[1-9](?:[ .-]?\d{2}){4}|0[1-9](?:[ .-]?\d{2}){4})\b")
+RE_LOG_LEVEL = re.compile(r"\b(DEBUG|INFO|WARN|WARNING|ERROR|CRITICAL|FATAL)\b", re.IGNORECASE)
+
+# Whole-buffer variant for counting: first level on each line (like the
+# per-line search), matched over raw bytes without splitting into lines.
+RE_LOG_LEVEL_B = re.compile(
+    rb"^[^\n]*?\b(DEBUG|INFO|WARN|WARNING|ERROR|CRITICAL|FATAL)\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+LOG_LEVELS = ("DEBUG", "INFO", "WARN", "WARNING", "ERROR", "CRITICAL", "FATAL")
+
+# Sanity checks: a mis-escaped pattern fails here instead of silently finding nothing
+assert RE_IPv4.search("src=192.168.1.1")
+assert RE_EMAIL.search("mail alice@example.com")
+assert RE_FR_PHONE.search("tel 06 12 34 56 78")
+assert RE_LOG_LEVEL.search("2025-01-01 error: disk full")
+assert RE_LOG_LEVEL_B.findall(b"ok\nWARN low disk\n") == [b"WARN"]
 
 
 def read_lines(path: Optional[Path]) -> Iterator[Tuple[int, str]]:
@@ -44,25 +61,52 @@ def extract(pattern: re.Pattern, path: Optional[Path]) -> None:
     for _, line in read_lines(path):
         for m in pattern.findall(line):
             seen.add(m if isinstance(m, str) else m[0])
-    for item in sorted(seen):
-        print(item)
+    write_lines(sorted(seen))
+
+
+# extract prints one item per line: usually a single joined write, but past
+# WRITE_JOIN_MAX items the join is done WRITE_BATCH items at a time so the
+# temporary string does not double peak memory.
+WRITE_JOIN_MAX = 1_000_000
+WRITE_BATCH = 10_000
+
+
+def write_lines(items: List[str]) -> None:
+    """Write `items` to stdout one per line with a few large writes."""
+    if not items:
+        return
+    write = sys.stdout.write
+    step = len(items) if len(items) < WRITE_JOIN_MAX else WRITE_BATCH
+    for i in range(0, len(items), step):
+        write("\n".join(items[i : i + step]))
+        write("\n")
+
+
+def count_log_levels(path: Optional[Path]) -> Counter:
+    """Count log levels in one regex pass over the raw bytes of the input."""
+    if path is None or str(path) == "-":
+        return Counter(map(bytes.upper, RE_LOG_LEVEL_B.findall(sys.stdin.buffer.read())))
+    with path.open("rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file: nothing to map
+            return Counter()
+        with mm:
+            return Counter(map(bytes.upper, RE_LOG_LEVEL_B.findall(mm)))
 
 
 def log_criticality(path: Optional[Path], count: bool) -> None:
-    counters = {}
+    if count:
+        counters = count_log_levels(path)
+        for lvl in LOG_LEVELS:
+            n = counters.get(lvl.encode())
+            if n:
+                print(f"{lvl}: {n}")
+        return
     for _, line in read_lines(path):
         m = RE_LOG_LEVEL.search(line)
-        if not m:
-            continue
-        lvl = m.group(1).upper()
-        if count:
-            counters[lvl] = counters.get(lvl, 0) + 1
-        else:
-            print(f"{lvl}: {line}")
-    if count:
-        for lvl in ["DEBUG", "INFO", "WARN", "WARNING", "ERROR", "CRITICAL", "FATAL"]:
-            if lvl in counters:
-                print(f"{lvl}: {counters[lvl]}")
+        if m:
+            print(f"{m.group(1).upper()}: {line}")
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -2,7 +2,8 @@
 """
 DevOps Regex Utilities (SOC-friendly)
 
-Quick, stdlib-only helpers for common DevOps/SOC tasks using regex:
+Quick, stdlib-only helpers for common DevOps/SOC tasks using regex (if the
+optional google-re2 package is installed, its linear-time engine is used):
 - grep: search files with a regex (print matches + line numbers)
 - extract-ips | extract-urls | extract-emails: pull IOCs from text/files
 - validate: validate IPv4 and CIDR strings
@@ -10,6 +11,10 @@ Quick, stdlib-only helpers for common DevOps/SOC tasks using regex:
 - bump-semver: bump x.y.z in a file (first occurrence)
 - tail-match: read stdin and print lines that match a regex (for piping)
 
+User patterns (grep, tail-match) run on re2 when installed. Otherwise they
+run through `regex` with a search timeout, or through stdlib re, which
+rejects nested quantifiers such as (a+)+.
+
 Usage examples:
   # grep for errors in a log
   python python/devops_regex_tools.py grep -p "ERROR|CRITICAL" /var/log/app.log
@@ -34,38 +39,273 @@ Usage examples:
 from __future__ import annotations
 
 import argparse
+import ipaddress
 import json
+import mmap
 import re
 import sys
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 import os
-from typing import Iterable, Iterator, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
-# Basic regexes
-RE_IPv4 = re.compile(
-    r"\b(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)\b"
-)
-RE_CIDR = re.compile(
-    r"^((?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d))\/(\d|[12]\d|3[0-2])$"
-)
-RE_URL = re.compile(r"\bhttps?://[^\s\]\[<>\)\(\"']+", re.IGNORECASE)
-RE_EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
-RE_FR_PHONE = re.compile(
-    r"\b(?:\+33\s?[1-9](?:[ .-]?\d{2}){4}|0[1-9](?:[ .-]?\d{2}){4})\b"
-)
-RE_LOG_LEVEL = re.compile(
-    r"\b(DEBUG|INFO|WARN|WARNING|ERROR|CRITICAL|FATAL)\b", re.IGNORECASE
-)
+try:  # optional fast path: orjson writes each JSONL record as bytes + "\n"
+    import orjson
+
+    def _dumps_line(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+except ImportError:
+
+    def _dumps_line(obj) -> bytes:
+        return (
+            json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n"
+        ).encode("utf-8")
+
+
+try:  # optional: google-re2 (linear-time DFA, no catastrophic backtracking)
+    import re2 as _re
+except ImportError:
+    _re = re
+
+
+def _compile(pattern: Union[str, bytes]):
+    """Compile with re2 when available; fall back to `re` for constructs re2
+    does not support (backreferences, lookarounds)."""
+    try:
+        return _re.compile(pattern)
+    except Exception:
+        return re.compile(pattern)
+
+
+try:  # optional: `regex` supports a per-call timeout on matching
+    import regex as _regex
+except ImportError:
+    _regex = None
+
+# Seconds a single user-pattern search may run under the `regex` fallback
+USER_REGEX_TIMEOUT = 1.0
+
+# Quantifier at src[i]: "*", "+", "?" or "{m}", "{m,}", "{,n}", "{m,n}"
+_QUANT = re.compile(r"[*+?]|\{(\d*)(,?)(\d*)\}")
+
+
+def _parse_re(src: str, i: int = 0) -> Tuple[list, int]:
+    """Split `src` from `i` into (atom, repeat, body) items, up to the end of
+    the enclosing group; "|" is kept as a plain string.
+
+    `repeat` is None (no quantifier or a fixed {n}), "opt" (? or {0,1}),
+    "var" (bounded {m,n}) or "inf" (*, +, {m,}); `body` is a group's own
+    item list, else None. Only what _nested_quantifier() needs is modelled.
+    """
+    items: list = []
+    n = len(src)
+    while i < n:
+        c = src[i]
+        if c == ")":
+            return items, i + 1
+        if c == "|":
+            items.append("|")
+            i += 1
+            continue
+        body = None
+        if c == "(":
+            body, j = _parse_re(src, i + 1)
+        elif c == "\\":
+            j = i + 2
+        elif c == "[":
+            j = i + 2 if src.startswith("^", i + 1) else i + 1
+            j += 1 if src.startswith("]", j) else 0
+            while j < n and src[j] != "]":
+                j += 2 if src[j] == "\\" else 1
+            j += 1
+        else:
+            j = i + 1
+        atom, repeat = src[i:j], None
+        m = _QUANT.match(src, j)
+        if m and (m.group(0)[0] != "{" or m.group(1) or m.group(3)):
+            lo, comma, hi = m.groups()
+            if m.group(0) in ("*", "+") or (comma and not hi):
+                repeat = "inf"
+            elif m.group(0) == "?" or (comma and int(lo or 0) == 0 and hi == "1"):
+                repeat = "opt"
+            elif comma and int(lo or 0) != int(hi):
+                repeat = "var"
+            j = m.end()
+            if src.startswith(("?", "+"), j):  # lazy or possessive
+                j += 1
+        items.append((atom, repeat, body))
+        i = j
+    return items, i
+
+
+def _literal(atom: str) -> Optional[str]:
+    """The one character a plain or escaped-punctuation atom matches."""
+    if len(atom) == 1 and atom not in ".^$":
+        return atom
+    if len(atom) == 2 and atom[0] == "\\" and not atom[1].isalnum():
+        return atom[1]
+    return None
+
+
+def _repeats(items: list) -> bool:
+    """True if `items` (or a group inside them) repeat a variable length."""
+    return any(
+        it != "|" and (it[1] in ("var", "inf") or (it[2] and _repeats(it[2])))
+        for it in items
+    )
+
+
+def _guarded(items: list) -> bool:
+    r"""True if every repeat in `items` is a single atom followed by a
+    required literal it cannot match, as in (\w+\.)+: each pass of the
+    outer repeat then has one way to split, so it cannot blow up."""
+    if "|" in items:
+        return False
+    for k, (atom, repeat, body) in enumerate(items):
+        if body is not None and _repeats(body):
+            return False
+        if repeat not in ("var", "inf"):
+            continue
+        nxt = items[k + 1] if k + 1 < len(items) else None
+        lit = _literal(nxt[0]) if nxt and nxt[1] is None and nxt[2] is None else None
+        if body is not None or lit is None:
+            return False
+        try:
+            if re.fullmatch(atom, lit, re.IGNORECASE):
+                return False
+        except re.error:
+            return False
+    return True
+
+
+def _nested_quantifier(items: list) -> bool:
+    r"""True for an unbounded repeat of a group that itself repeats a
+    variable length, e.g. (a+)+ or (\w+\s?)*: the exponential-backtracking
+    shape. (\d{1,3}\.){3} (bounded outer repeat) and (\w+\.)+ (see
+    _guarded) are allowed."""
+    for it in items:
+        if it == "|" or it[2] is None:
+            continue
+        _, repeat, body = it
+        if repeat == "inf" and _repeats(body) and not _guarded(body):
+            return True
+        if _nested_quantifier(body):
+            return True
+    return False
+
+
+class _TimeoutPattern:
+    """`regex` pattern whose search() gives up after USER_REGEX_TIMEOUT."""
+
+    __slots__ = ("_rx",)
+
+    def __init__(self, rx) -> None:
+        self._rx = rx
+
+    def search(self, string):
+        return self._rx.search(string, timeout=USER_REGEX_TIMEOUT)
+
+
+def _safe_compile(pattern: Union[str, bytes]):
+    """Compile a user-supplied pattern without exposing a backtracking DoS.
+
+    Prefers re2 (linear time). If re2 is missing or rejects the pattern,
+    uses `regex` with a search timeout when installed, otherwise stdlib `re`
+    after refusing nested quantifiers. Raises ValueError for patterns that
+    are invalid or refused.
+    """
+    if _re is not re:
+        try:
+            return _re.compile(pattern)
+        except Exception:
+            pass  # e.g. backreferences/lookarounds; try the fallbacks below
+    try:
+        if _regex is not None:
+            rx = _TimeoutPattern(_regex.compile(pattern))
+            print(
+                "warning: re2 unavailable for this pattern; using `regex` with a "
+                f"{USER_REGEX_TIMEOUT:g}s search timeout",
+                file=sys.stderr,
+            )
+            return rx
+        src = (
+            pattern.decode("utf-8", "replace")
+            if isinstance(pattern, bytes)
+            else pattern
+        )
+        if _nested_quantifier(_parse_re(src)[0]):
+            raise ValueError(
+                "nested quantifier may backtrack catastrophically "
+                "(install google-re2 to allow it)"
+            )
+        rx = re.compile(pattern)
+        print(
+            "warning: re2 not installed; using stdlib re for user pattern",
+            file=sys.stderr,
+        )
+        return rx
+    except ValueError:
+        raise
+    except Exception as e:  # re.error / regex.error
+        raise ValueError(str(e)) from e
+
+
+# Basic regexes (inline flags so the same source works for re and re2)
+_IPV4_SRC = r"\b(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)\b"
+_URL_SRC = r"(?i)\bhttps?://[^\s\]\[<>\)\(\"']+"
+_EMAIL_SRC = r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"
+_FR_PHONE_SRC = r"\b(?:\+33\s?[1-9](?:[ .-]?\d{2}){4}|0[1-9](?:[ .-]?\d{2}){4})\b"
+
+# Extraction only; full-string validation goes through ipaddress below
+RE_IPv4 = _compile(_IPV4_SRC)
+RE_URL = _compile(_URL_SRC)
+RE_EMAIL = _compile(_EMAIL_SRC)
+RE_FR_PHONE = _compile(_FR_PHONE_SRC)
+RE_SEMVER = _compile(r"\b(\d+)\.(\d+)\.(\d+)\b")
+_LOG_LEVEL_SRC = r"(?i)\b(DEBUG|INFO|WARN|WARNING|ERROR|CRITICAL|FATAL)\b"
+RE_LOG_LEVEL = _compile(_LOG_LEVEL_SRC)
 
 
 # NGINX common/combined log format (best-effort)
-RE_NGINX = re.compile(
+_NGINX_SRC = (
     r"^(?P<remote_addr>\S+)\s+-\s+(?P<remote_user>\S+)\s+\[(?P<time_local>[^\]]+)\]\s+\"(?P<request>[A-Z]+\s+[^\s]+\s+HTTP/[0-9.]+)\"\s+"
     r"(?P<status>\d{3})\s+(?P<body_bytes_sent>\d+)\s+\"(?P<http_referer>[^\"]*)\"\s+\"(?P<http_user_agent>[^\"]*)\""
 )
+RE_NGINX = _compile(_NGINX_SRC)
+
+# Bytes variants: scan raw file contents without decoding every line
+RE_IPv4_B = _compile(_IPV4_SRC.encode())
+RE_URL_B = _compile(_URL_SRC.encode())
+RE_EMAIL_B = _compile(_EMAIL_SRC.encode())
+# Whole-buffer scans see newlines: [ \t] instead of \s keeps "+33" from
+# pairing with digits on the next line.
+RE_FR_PHONE_B = _compile(
+    rb"\b(?:\+33[ \t]?[1-9](?:[ .-]?\d{2}){4}|0[1-9](?:[ .-]?\d{2}){4})\b"
+)
+RE_LOG_LEVEL_B = _compile(_LOG_LEVEL_SRC.encode())
+
+# Bytes NGINX pattern with positional groups, usable line by line (.match)
+# or over a whole mapped file (finditer; MULTILINE anchors ^ at each line
+# and no group can cross a newline). Groups: 1 remote_addr, 2 remote_user,
+# 3 time_local, 4 request (5 method, 6 path, 7 http), 8 status,
+# 9 body_bytes_sent, 10 http_referer, 11 http_user_agent.
+RE_NGINX_B = _compile(
+    rb"(?m)^(\S+)[ \t]+-[ \t]+(\S+)[ \t]+\[([^\]\n]+)\][ \t]+"
+    rb"\"(([A-Z]+)[ \t]+(\S+)[ \t]+(HTTP/[0-9.]+))\"[ \t]+"
+    rb"(\d{3})[ \t]+(\d+)[ \t]+\"([^\"\n]*)\"[ \t]+\"([^\"\n]*)\""
+)
 
 
-def read_lines(path: Optional[Path]) -> Iterator[Tuple[int, str]]:
+def read_lines(
+    path: Optional[Path], binary: bool = False
+) -> Iterator[Tuple[int, Union[str, bytes]]]:
+    """Yield (lineno, line) without the newline. binary=True yields raw bytes
+    and skips UTF-8 decoding entirely (use with bytes patterns)."""
+    if binary:
+        yield from read_lines_b(path)
+        return
     if path is None or str(path) == "-":
         for i, line in enumerate(sys.stdin, 1):
             yield i, line.rstrip("\n")
@@ -75,51 +315,173 @@ def read_lines(path: Optional[Path]) -> Iterator[Tuple[int, str]]:
                 yield i, line.rstrip("\n")
 
 
-def cmd_grep(pattern: str, path: Optional[Path]):
-    rx = re.compile(pattern)
+def read_lines_b(path: Optional[Path]) -> Iterator[Tuple[int, bytes]]:
+    """Like read_lines() but yields raw bytes; callers decode only what they print."""
+    if path is None or str(path) == "-":
+        for i, line in enumerate(sys.stdin.buffer, 1):
+            yield i, line.rstrip(b"\r\n")
+    else:
+        with path.open("rb") as f:
+            for i, line in enumerate(f, 1):
+                yield i, line.rstrip(b"\r\n")
+
+
+@contextmanager
+def read_bytes(path: Optional[Path]) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Whole input as one bytes-like buffer: a read-only mmap for files,
+    the full stdin contents otherwise."""
+    if path is None or str(path) == "-":
+        yield sys.stdin.buffer.read()
+        return
+    with path.open("rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files cannot be mapped
+            yield b""
+            return
+        with mm:
+            yield mm
+
+
+# Matches found in a multi-GB mapping can number in the millions; past
+# WRITE_JOIN_MAX they are joined per WRITE_BATCH slice rather than into one
+# bytes object the size of the whole output.
+WRITE_JOIN_MAX = 1_000_000
+WRITE_BATCH = 10_000
+
+
+def write_lines_b(items: List[bytes]) -> None:
+    """Write `items` to stdout as raw bytes, one per line, in as few write
+    calls as possible (no decode and no per-line print)."""
+    if not items:
+        return
+    write = sys.stdout.buffer.write
+    step = len(items) if len(items) < WRITE_JOIN_MAX else WRITE_BATCH
+    for i in range(0, len(items), step):
+        write(b"\n".join(items[i : i + step]))
+        write(b"\n")
+    sys.stdout.buffer.flush()
+
+
+def _decode(b: bytes) -> str:
+    return b.decode("utf-8", errors="replace")
+
+
+def cmd_grep(rx, path: Optional[Path]):
+    """Print matching lines; `rx` is a str pattern from _safe_compile().
+
+    Lines are decoded first so user patterns keep Unicode semantics (word
+    characters, classes like [é]), which a bytes pattern would apply per
+    UTF-8 byte.
+    """
     for ln, line in read_lines(path):
         if rx.search(line):
             print(f"{ln}: {line}")
 
 
+# Files larger than this are scanned by a process pool (one chunk per core);
+# below it the fork/spawn cost outweighs the gain.
+PARALLEL_EXTRACT_MIN = 64 << 20
+
+
+def _chunk_bounds(buf, size: int, n: int) -> List[Tuple[int, int]]:
+    """Split [0, size) into about n ranges, each ending just after a newline."""
+    step = max(1, -(-size // n))
+    bounds: List[Tuple[int, int]] = []
+    start = 0
+    while start < size:
+        end = buf.find(b"\n", min(start + step, size) - 1)
+        end = size if end == -1 else end + 1
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _extract_chunk(path: str, src: bytes, start: int, end: int) -> set:
+    """Worker: unique matches of `src` within buf[start:end] of the mapped file."""
+    rx = _compile(src)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return set(rx.findall(mm, start, end))
+
+
+def _extract_parallel(pattern, path: Path, size: int) -> set:
+    # Workers recompile from the pattern source (re2 patterns don't pickle)
+    # and map the file themselves, so only offsets cross process boundaries.
+    # Chunks end on line boundaries; none of the bytes patterns in
+    # extract_map can match a newline, so no hit spans two chunks.
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = os.cpu_count() or 1
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        bounds = _chunk_bounds(mm, size, workers)
+    with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as pool:
+        futures = [
+            pool.submit(_extract_chunk, str(path), pattern.pattern, start, end)
+            for start, end in bounds
+        ]
+        return set().union(*(fut.result() for fut in futures))
+
+
 def cmd_extract(pattern: re.Pattern, path: Optional[Path]):
-    hits = set()
-    for _, line in read_lines(path):
-        hits.update(pattern.findall(line))
-    for h in sorted(hits):
-        print(h)
+    """Print unique matches of a bytes `pattern`, scanning the whole input at once."""
+    size = path.stat().st_size if path is not None and str(path) != "-" else 0
+    if size > PARALLEL_EXTRACT_MIN and (os.cpu_count() or 1) > 1:
+        hits = _extract_parallel(pattern, path, size)  # type: ignore[arg-type]
+    else:
+        with read_bytes(path) as buf:
+            hits = set(pattern.findall(buf))
+    write_lines_b(sorted(hits))
 
 
 def cmd_extract_fr_phone(path: Optional[Path]):
     """Extract French phone numbers in various formats.
     Examples: 0612345678, 06 12 34 56 78, 06-12-34-56-78, +33 6 12 34 56 78
     """
-    return cmd_extract(RE_FR_PHONE, path)
+    return cmd_extract(RE_FR_PHONE_B, path)
 
 
 def cmd_log_criticality(path: Optional[Path], count: bool):
     """Detect log criticality levels. If count=True, print totals per level; else print level and line."""
+    # Lines stay bytes: the level keywords are ASCII, so only printed lines
+    # are decoded.
     levels = {}
-    for ln, line in read_lines(path):
-        m = RE_LOG_LEVEL.search(line)
+    for ln, line in read_lines(path, binary=True):
+        m = RE_LOG_LEVEL_B.search(line)
         if m:
-            lvl = m.group(1).upper()
+            lvl = m.group(1).upper().decode("ascii")
             if count:
                 levels[lvl] = levels.get(lvl, 0) + 1
             else:
-                print(f"{lvl}: {line}")
+                print(f"{lvl}: {_decode(line)}")
     if count:
         for lvl in ["DEBUG", "INFO", "WARN", "WARNING", "ERROR", "CRITICAL", "FATAL"]:
             if lvl in levels:
                 print(f"{lvl}: {levels[lvl]}")
 
 
+# Validation is pure and real inputs repeat a lot (top talkers, scanners).
+# ipaddress parses and range-checks the octets directly, no regex needed.
+@lru_cache(maxsize=131072)
 def is_valid_ipv4(ip: str) -> bool:
-    return bool(RE_IPv4.fullmatch(ip))
+    try:
+        ipaddress.IPv4Address(ip)
+    except ValueError:
+        return False
+    return True
 
 
+@lru_cache(maxsize=131072)
 def is_valid_cidr(cidr: str) -> bool:
-    return bool(RE_CIDR.fullmatch(cidr))
+    # Require an explicit numeric prefix ("a.b.c.d/nn"): IPv4Network would
+    # also take a bare address or a dotted netmask. Host bits are allowed.
+    _, sep, prefix = cidr.partition("/")
+    if not sep or not (prefix.isascii() and prefix.isdigit()):
+        return False
+    try:
+        ipaddress.IPv4Network(cidr, strict=False)
+    except ValueError:
+        return False
+    return True
 
 
 def cmd_validate(ip: Optional[str], cidr: Optional[str]):
@@ -131,7 +493,19 @@ def cmd_validate(ip: Optional[str], cidr: Optional[str]):
     print(json.dumps(result, indent=2))
 
 
-def parse_nginx_line(line: str) -> Optional[dict]:
+def parse_nginx_line(line: Union[str, bytes]) -> Optional[dict]:
+    """Parse one access-log line; returns a fresh dict (safe to mutate)."""
+    parsed = _parse_nginx_cached(line)
+    return dict(parsed) if parsed is not None else None
+
+
+# Identical lines are common (health checks, polling clients); keep the cache
+# small since each entry holds a whole line plus its parsed fields.
+@lru_cache(maxsize=4096)
+def _parse_nginx_cached(line: Union[str, bytes]) -> Optional[dict]:
+    if isinstance(line, bytes):
+        m = RE_NGINX_B.match(line)
+        return _nginx_record(m) if m else None
     m = RE_NGINX.match(line)
     if not m:
         return None
@@ -145,27 +519,83 @@ def parse_nginx_line(line: str) -> Optional[dict]:
     return d
 
 
+def _nginx_record(m) -> dict:
+    """Build the parsed-line dict from a RE_NGINX_B match by group index."""
+    g = m.group
+    return {
+        "remote_addr": _decode(g(1)),
+        "remote_user": _decode(g(2)),
+        "time_local": _decode(g(3)),
+        "request": _decode(g(4)),
+        "status": _decode(g(8)),
+        "body_bytes_sent": _decode(g(9)),
+        "http_referer": _decode(g(10)),
+        "http_user_agent": _decode(g(11)),
+        "method": _decode(g(5)),
+        "path": _decode(g(6)),
+        "http": _decode(g(7)),
+    }
+
+
+def print_cache_stats() -> None:
+    """Report memoization hit rates on stderr (see --stats)."""
+    for name, fn in (
+        ("is_valid_ipv4", is_valid_ipv4),
+        ("is_valid_cidr", is_valid_cidr),
+        ("parse_nginx_line", _parse_nginx_cached),
+    ):
+        print(f"[stats] {name}: {fn.cache_info()}", file=sys.stderr)
+
+
+# Records between explicit flushes when streaming parse-nginx output
+NGINX_FLUSH_EVERY = 4096
+
+
 def cmd_parse_nginx(path: Optional[Path]):
-    for _, line in read_lines(path):
-        parsed = parse_nginx_line(line)
+    # One buffered binary writer: no per-record print()/text-layer overhead.
+    # Flush every NGINX_FLUSH_EVERY records so piped consumers (e.g. tail -f
+    # | parse-nginx | jq) still see output while the input keeps streaming.
+    out = sys.stdout.buffer
+    write = out.write
+    if path is not None and str(path) != "-":
+        # Files: one finditer pass over the mapped file, no per-line split
+        with read_bytes(path) as buf:
+            for m in RE_NGINX_B.finditer(buf):
+                write(_dumps_line(_nginx_record(m)))
+        out.flush()
+        return
+    pending = 0
+    for _, line in read_lines_b(path):
+        # Serialized straight away, so the cached dict can be used uncopied
+        parsed = _parse_nginx_cached(line)
         if parsed:
-            print(json.dumps(parsed, ensure_ascii=False))
+            write(_dumps_line(parsed))
+            pending += 1
+            if pending >= NGINX_FLUSH_EVERY:
+                out.flush()
+                pending = 0
+    out.flush()
 
 
 def bump_semver_in_text(text: str, part: str) -> Tuple[str, Optional[str]]:
-    m = re.search(r"\b(\d+)\.(\d+)\.(\d+)\b", text)
-    if not m:
+    bumped: List[str] = []
+
+    def _bump_repl(m) -> str:
+        major, minor, patch = map(int, m.groups())
+        if part == "major":
+            major, minor, patch = major + 1, 0, 0
+        elif part == "minor":
+            minor, patch = minor + 1, 0
+        else:
+            patch += 1
+        bumped.append(f"{major}.{minor}.{patch}")
+        return bumped[0]
+
+    # One sub() pass replaces the first match in place (no slice + concat)
+    new_text = RE_SEMVER.sub(_bump_repl, text, count=1)
+    if not bumped:
         return text, None
-    major, minor, patch = map(int, m.groups())
-    if part == "major":
-        major, minor, patch = major + 1, 0, 0
-    elif part == "minor":
-        minor, patch = minor + 1, 0
-    else:
-        patch += 1
-    new = f"{major}.{minor}.{patch}"
-    start, end = m.span()
-    return text[:start] + new + text[end:], new
+    return new_text, bumped[0]
 
 
 def cmd_bump_semver(path: Path, part: str):
@@ -178,8 +608,8 @@ def cmd_bump_semver(path: Path, part: str):
     print(new_ver)
 
 
-def cmd_tail_match(pattern: str):
-    rx = re.compile(pattern)
+def cmd_tail_match(rx):
+    """Echo stdin lines matching `rx`, a str pattern from _safe_compile()."""
     for line in sys.stdin:
         if rx.search(line):
             sys.stdout.write(line)
@@ -188,6 +618,11 @@ def cmd_tail_match(pattern: str):
 
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="DevOps Regex Utilities")
+    p.add_argument(
+        "--stats",
+        action="store_true",
+        help="print validation/parse cache statistics to stderr on exit",
+    )
     sub = p.add_subparsers(dest="cmd", required=True)
 
     p_grep = sub.add_parser("grep", help="grep a file/stdin with regex")
@@ -251,23 +686,35 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
 
     # Single dispatch for extract commands
     extract_map = {
-        "extract-ips": RE_IPv4,
-        "extract-urls": RE_URL,
-        "extract-emails": RE_EMAIL,
-        "extract-fr-phone": RE_FR_PHONE,
+        "extract-ips": RE_IPv4_B,
+        "extract-urls": RE_URL_B,
+        "extract-emails": RE_EMAIL_B,
+        "extract-fr-phone": RE_FR_PHONE_B,
     }
 
+    # User-supplied regexes are compiled (and vetted) once, before any input
+    # is read, so a bad or dangerous pattern fails fast with exit status 2.
+    rx = None
+    try:
+        if args.cmd == "grep":
+            pattern = args.pattern or os.getenv("REGEX_PATTERN", None)
+            if not pattern:
+                print(
+                    "grep: pattern missing (provide -p/--pattern or set REGEX_PATTERN)",
+                    file=sys.stderr,
+                )
+                return 2
+            rx = _safe_compile(pattern)
+        elif args.cmd == "tail-match":
+            rx = _safe_compile(args.pattern)
+    except ValueError as e:
+        print(f"{args.cmd}: rejected pattern: {e}", file=sys.stderr)
+        return 2
+
     if args.cmd in extract_map:
         cmd_extract(extract_map[args.cmd], path_opt)
     elif args.cmd == "grep":
-        pattern = args.pattern or os.getenv("REGEX_PATTERN", None)
-        if not pattern:
-            print(
-                "grep: pattern missing (provide -p/--pattern or set REGEX_PATTERN)",
-                file=sys.stderr,
-            )
-            return 2
-        cmd_grep(pattern, path_opt)
+        cmd_grep(rx, path_opt)
     elif args.cmd == "validate":
         ip = getattr(args, "ip", None) or os.getenv("IP")
         cidr = getattr(args, "cidr", None) or os.getenv("CIDR")
@@ -277,7 +724,7 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
     elif args.cmd == "bump-semver":
         cmd_bump_semver(Path(args.file), args.part)
     elif args.cmd == "tail-match":
-        cmd_tail_match(args.pattern)
+        cmd_tail_match(rx)
     elif args.cmd == "log-criticality":
         count_env = os.getenv("LOG_LEVEL_COUNT")
         count_flag = (
@@ -289,6 +736,8 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
     else:
         print("Unknown command", file=sys.stderr)
         return 2
+    if args.stats:
+        print_cache_stats()
     return 0
 
 
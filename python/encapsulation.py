@@ -6,8 +6,11 @@ This file shows:
 - Property decorators for getters and setters
 - Controlled access to class attributes
 - Data validation and logging in setters
+- __slots__ and interned strings to keep many instances small
 """
 
+import sys
+
 # Run static type checks with mypy:
 #   mypy --hide-error-codes --pretty main_encapsulation.py
 # If mypy was installed via pip --user and isn't on PATH (as on this machine):
@@ -16,6 +19,9 @@ This file shows:
 
 
 class Person:
+    # No per-instance __dict__: three fixed slots instead
+    __slots__ = ("_name", "_age", "_gender")
+
     def __init__(self, name: str, age: int, gender: str) -> None:
         # Use properties to leverage validation
         self._name = name
@@ -38,7 +44,8 @@ class Person:
         if value.lower() == "thierry":
             self._name = "root"
         else:
-            self._name = value
+            # Names repeat across many records; share one string object
+            self._name = sys.intern(value)
 
     @property
     def age(self) -> int:
@@ -64,7 +71,7 @@ class Person:
         allowed = {"Male", "Female", "Other"}
         if normalized not in allowed:
             raise ValueError(f"gender must be one of {sorted(allowed)}")
-        self._gender = normalized
+        self._gender = sys.intern(normalized)
 
     @staticmethod
     def is_adult(age: int) -> bool:
@@ -5,18 +5,342 @@ Simplest usage:
   python main_script_argument.py --kind auth --message "Failed login" \
     --username alice --ip 203.0.113.25
 
+Batch usage (one JSON object per line; CLI flags act as defaults):
+  producer | python main_script_argument.py --batch - --kind auth
+
+Long-lived mode (audit log opened once; each line written as it arrives):
+  python main_script_argument.py --serve --batch /run/soc/events.fifo
+
+Per-event forks from scripts can skip flag parsing entirely:
+  SOC_FAST=1 SOC_KIND=auth SOC_MSG="Failed login" python main_script_argument.py
+
 Severity defaults to 'medium'. Override with --severity low|medium|high|critical.
-Use SOC_AUDIT_LOG to change the output file.
+Use SOC_AUDIT_LOG to change the output file; a .zst suffix (e.g.
+audit.jsonl.zst) compresses it with zstd, which needs zstandard. Pass
+--fsync to force the line to disk before the command returns, or
+--group-commit [N] to fsync once per N events / --group-commit-ms in batch
+and serve mode. --sink udp://host:port or --sink unix:/path sends one
+datagram per event to a local collector (rsyslog, vector, fluent-bit)
+instead. The audit log is used only when the sink cannot be opened: a UDP
+host that does not resolve, or a unix: socket that is missing or refuses
+the connection. UDP has no handshake, so events sent to a resolvable host
+with no collector listening are lost without an error.
 """
 
 from __future__ import annotations
 
-import argparse
-import json
 import os
 import sys
 import time
-from typing import Any, Dict
+from functools import partial
+from types import SimpleNamespace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+if TYPE_CHECKING:  # annotations only; both are imported where they are used
+    import argparse
+    import socket
+
+try:  # optional fast path: orjson writes each JSONL record as bytes + "\n"
+    import orjson
+
+    def _dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+    _loads = orjson.loads
+except ImportError:  # stdlib fallback keeps the CLI dependency-free
+    import json
+
+    def _dumps_line(obj: Any) -> bytes:
+        # Newline added to the str, so the line is encoded once, not copied again
+        return (json.dumps(obj, separators=(",", ":"), ensure_ascii=False) + "\n").encode(
+            "utf-8"
+        )
+
+    _loads = json.loads  # also accepts bytes
+
+
+SEVERITIES = ("low", "medium", "high", "critical")
+# Built once at import, so embedding callers never rebuild it; O(1) lookups
+# for both CLI parse paths and every --batch line.
+_SEVERITY_SET = frozenset(SEVERITIES)
+
+# --batch and --serve stamp many events per second, so the formatted value
+# is kept per epoch second: [epoch_second, "YYYY-MM-DDTHH:MM:SSZ"].
+_ts_cache: List[Any] = [-1, ""]
+
+
+def _iso_now() -> str:
+    """Default event stamp (see --epoch-ms for the integer alternative)."""
+    s = int(time.time())
+    if s != _ts_cache[0]:
+        _ts_cache[0] = s
+        _ts_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(s))
+    return _ts_cache[1]
+
+
+def _epoch_ms() -> int:
+    """UTC timestamp as integer epoch milliseconds (--epoch-ms): no formatting."""
+    return time.time_ns() // 1_000_000
+
+
+# --group-commit defaults: fsync once per this many events, or sooner once
+# the oldest unsynced event has waited this long
+GROUP_COMMIT_EVENTS = 256
+GROUP_COMMIT_MS = 10
+
+# Batch mode flushes once this many events or bytes are pending. Each flush
+# is one os.writev() on an O_APPEND descriptor (one iovec per event, capped
+# at the platform's IOV_MAX) instead of a write() per event.
+MAX_BATCH_EVENTS = 1000
+MAX_BATCH_BYTES = 64 * 1024
+if hasattr(os, "sysconf") and "SC_IOV_MAX" in os.sysconf_names:
+    _iov_max = os.sysconf("SC_IOV_MAX")
+    if _iov_max > 0:  # -1: no documented limit
+        MAX_BATCH_EVENTS = min(MAX_BATCH_EVENTS, _iov_max)
+
+
+# One O_APPEND write up to this size is atomic everywhere POSIX applies
+# (PIPE_BUF); Linux keeps larger appends to regular files whole too, but
+# other systems may interleave them with concurrent writers.
+ATOMIC_APPEND_MAX = 4096
+
+
+def open_audit_log(path: str) -> int:
+    """Open `path` for appending and return the raw file descriptor.
+
+    O_APPEND makes every write land at the current end of the file, and
+    _write_all() hands each line (or batch) to the kernel in one syscall,
+    so concurrent CLI invocations never interleave partial lines and no
+    flock/fcntl locking is needed.
+    """
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    return os.open(path, flags, 0o644)
+
+
+def _write_all(fd: int, chunks: List[bytes]) -> None:
+    """Write every byte of `chunks` to `fd`, one syscall when possible."""
+    if len(chunks) == 1:  # single event: plain write(), no iovec setup
+        data = chunks[0]
+        written = os.write(fd, data)
+        if written < len(data):
+            rest = memoryview(data)[written:]
+            while rest:
+                rest = rest[os.write(fd, rest) :]
+        return
+    if not hasattr(os, "writev"):  # Windows: no vectored I/O, join once
+        data = memoryview(b"".join(chunks))
+        while data:
+            data = data[os.write(fd, data) :]
+        return
+    total = sum(map(len, chunks))
+    written = os.writev(fd, chunks)
+    if written < total:  # short write (rare on regular files): finish it
+        rest = memoryview(b"".join(chunks))[written:]
+        while rest:
+            rest = rest[os.write(fd, rest) :]
+
+
+def open_log_writer(
+    path: str, threads: int = 0, flush_each: bool = False
+) -> Tuple[Callable[[List[bytes]], None], Callable[[], None], Callable[[], None]]:
+    """Open the audit log; return its (write, sync, close) callables.
+
+    Paths ending in .zst (e.g. audit.jsonl.zst) are zstd-compressed at
+    level 3 with `threads` workers, which needs the optional zstandard
+    package. Each run appends one zstd frame; concatenated frames decode
+    as one stream (zstdcat, zstd -d). `flush_each` ends a zstd block after
+    every write so --serve output is readable without waiting for exit.
+    """
+    fd = open_audit_log(path)
+    if not path.endswith(".zst"):
+        return partial(_write_all, fd), partial(os.fsync, fd), partial(os.close, fd)
+
+    import zstandard as zstd
+
+    writer = zstd.ZstdCompressor(level=3, threads=threads).stream_writer(
+        os.fdopen(fd, "ab", buffering=0)  # the compressor already emits large writes
+    )
+
+    def write(chunks: List[bytes]) -> None:
+        writer.write(b"".join(chunks))
+        if flush_each:
+            writer.flush(zstd.FLUSH_BLOCK)
+
+    def sync() -> None:
+        writer.flush(zstd.FLUSH_FRAME)
+        os.fsync(fd)
+
+    return write, sync, writer.close
+
+
+def with_group_commit(
+    write: Callable[[List[bytes]], None],
+    sync: Callable[[], None],
+    every: int,
+    interval_ms: int,
+) -> Tuple[Callable[[List[bytes]], None], Callable[[], None]]:
+    """Wrap `write` so sync() runs once per `every` events or `interval_ms`.
+
+    Whichever limit is hit first triggers the fsync, so at most
+    `interval_ms` of acknowledged events can be lost on a crash even when
+    the producer goes quiet (a timer thread covers that case). Returns
+    (write, finish); finish() syncs whatever is still pending.
+    """
+    import threading
+
+    lock = threading.Lock()
+    pending = 0
+    timer: Optional[threading.Timer] = None
+
+    def commit_locked() -> None:
+        nonlocal pending, timer
+        if timer is not None:
+            timer.cancel()
+            timer = None
+        if pending:
+            sync()
+            pending = 0
+
+    def on_timer() -> None:
+        with lock:
+            commit_locked()
+
+    def gc_write(chunks: List[bytes]) -> None:
+        nonlocal pending, timer
+        with lock:
+            write(chunks)
+            pending += len(chunks)
+            if pending >= every:
+                commit_locked()
+            elif timer is None:
+                timer = threading.Timer(interval_ms / 1000, on_timer)
+                timer.daemon = True
+                timer.start()
+
+    def finish() -> None:
+        with lock:
+            commit_locked()
+
+    return gc_write, finish
+
+
+def open_sink(url: str) -> "socket.socket":
+    """Return a datagram socket connected to udp://host:port or unix:/path.
+
+    Raises ValueError for a malformed URL and OSError when the host does not
+    resolve or the unix: socket cannot be connected to. connect() on a UDP
+    socket only sets the peer address, so a host with nothing listening is
+    not detected here.
+    """
+    import socket
+
+    if url.startswith("udp://"):
+        host, sep, port = url[len("udp://") :].rpartition(":")
+        if not (sep and host and port.isdigit()):
+            raise ValueError(f"invalid sink {url!r}: expected udp://host:port")
+        family, kind, proto, _, addr = socket.getaddrinfo(
+            host.strip("[]"), int(port), type=socket.SOCK_DGRAM
+        )[0]
+        sock = socket.socket(family, kind, proto)
+    elif url.startswith("unix:"):
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("unix: sinks are not supported on this platform")
+        addr = url[len("unix:") :]
+        if addr.startswith("//"):  # also accept unix:///path
+            addr = addr[2:]
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    else:
+        raise ValueError(f"invalid sink {url!r}: expected udp://host:port or unix:/path")
+    try:
+        sock.connect(addr)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _send_all(sock: "socket.socket", chunks: List[bytes]) -> None:
+    """Send each chunk as its own datagram: collectors read one per message."""
+    for chunk in chunks:
+        sock.send(chunk)
+
+
+def iter_batch_events(
+    source: BinaryIO,
+    defaults: Dict[str, Any],
+    stamp: Callable[[], Any] = _iso_now,
+) -> Iterator[Dict[str, Any]]:
+    """Yield one event per JSON-object line of `source`, on top of `defaults`.
+
+    Each event is stamped with stamp() when it is read, unless the line
+    carries its own "ts". Fields in the line win over the CLI defaults.
+    Blank lines are ignored; malformed or non-object lines, lines with a
+    severity outside SEVERITIES, and lines left without a kind or message
+    (by the line and the defaults alike) are reported on stderr and skipped.
+    """
+    for lineno, raw in enumerate(source, 1):
+        if not raw.strip():
+            continue
+        try:
+            data = _loads(raw)
+        except ValueError as e:
+            print(f"batch line {lineno}: invalid JSON ({e}), skipped", file=sys.stderr)
+            continue
+        if not isinstance(data, dict):
+            print(f"batch line {lineno}: not a JSON object, skipped", file=sys.stderr)
+            continue
+        sev = data.get("severity")
+        if sev is not None and (type(sev) is not str or sev not in _SEVERITY_SET):
+            print(f"batch line {lineno}: invalid severity {sev!r}, skipped", file=sys.stderr)
+            continue
+        # One dict display builds the event in a single pass; this measured
+        # faster than copy+update or mutating one reused template dict.
+        event = {**defaults, "ts": stamp(), **data}
+        missing = [name for name in ("kind", "message") if not event.get(name)]
+        if missing:
+            print(f"batch line {lineno}: missing {', '.join(missing)}, skipped", file=sys.stderr)
+            continue
+        yield event
+
+
+def write_events(
+    write: Callable[[List[bytes]], None],
+    events: Iterable[Dict[str, Any]],
+    max_events: int = MAX_BATCH_EVENTS,
+) -> int:
+    """Emit events as JSONL lines, handing `write` max_events/MAX_BATCH_BYTES at a time.
+
+    `write` is partial(_write_all, fd) for the audit log or
+    partial(_send_all, sock) for a socket sink. --serve passes max_events=1
+    so nothing sits in memory while waiting for the producer.
+    """
+    count = 0
+    pending: List[bytes] = []
+    size = 0
+    for event in events:
+        line = _dumps_line(event)
+        pending.append(line)
+        size += len(line)
+        count += 1
+        if len(pending) >= max_events or size >= MAX_BATCH_BYTES:
+            write(pending)
+            pending.clear()
+            size = 0
+    if pending:
+        write(pending)
+    return count
 
 
 def print_usage() -> None:
@@ -31,11 +355,22 @@ def print_usage() -> None:
     print("    --kind network --severity high \\")
     print('    --message "Port scan detected"')
     print("")
+    print("  some_producer | python main_script_argument.py --batch - --kind auth")
+    print("")
+    print("  python main_script_argument.py --sink udp://127.0.0.1:5514 \\")
+    print('    --kind auth --message "Failed login"')
+    print("")
     print("Environment:")
     print("  SOC_AUDIT_LOG   Path to JSONL audit log (default: soc_audit_log.jsonl)")
+    print("  SOC_FAST=1      With no arguments, read the event from SOC_KIND, SOC_MSG")
+    print("                  and optional SOC_SEVERITY, SOC_USERNAME, SOC_IP")
 
 
-def main() -> None:
+def build_parser() -> "argparse.ArgumentParser":
+    # Imported here: argparse (and the gettext/re it pulls in) is only
+    # needed for --help, --usage and error reporting, not the fast path.
+    import argparse
+
     # Create an argparse-based CLI suitable for SOC/DevOps tooling.
     # argparse provides clear help output, defaults, and type handling.
     parser = argparse.ArgumentParser(
@@ -44,13 +379,13 @@ def main() -> None:
     )
 
     # Core fields
-    # Required minimal fields
-    parser.add_argument("--kind", required=True, help="Event kind, e.g. auth, network, file")
-    parser.add_argument("--message", required=True, help="Human-readable message")
+    # Required minimal fields (in --batch mode they are defaults for each line)
+    parser.add_argument("--kind", help="Event kind, e.g. auth, network, file (required)")
+    parser.add_argument("--message", help="Human-readable message (required)")
     parser.add_argument(
         "--severity",
         default="medium",
-        choices=["low", "medium", "high", "critical"],
+        metavar="{" + ",".join(SEVERITIES) + "}",
         help="Event severity",
     )
 
@@ -64,7 +399,58 @@ def main() -> None:
     parser.add_argument(
         "--audit-log",
         default=os.getenv("SOC_AUDIT_LOG", "soc_audit_log.jsonl"),
-        help="Path to JSONL audit log file (can set SOC_AUDIT_LOG env)",
+        help=(
+            "Path to JSONL audit log file, zstd-compressed when it ends in .zst "
+            "(can set SOC_AUDIT_LOG env)"
+        ),
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="append many events: one JSON object per line from FILE or - for stdin",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="stay running: write each --batch line (default: stdin) as it arrives",
+    )
+    parser.add_argument(
+        "--sink",
+        metavar="URL",
+        help=(
+            "send events to udp://host:port or unix:/path instead of the audit log "
+            "(falls back to the log only if the host does not resolve or the unix "
+            "socket cannot be connected; UDP sends are not acknowledged)"
+        ),
+    )
+    parser.add_argument(
+        "--epoch-ms",
+        action="store_true",
+        help="write ts as integer epoch milliseconds instead of an ISO 8601 string",
+    )
+    parser.add_argument(
+        "--fsync",
+        action="store_true",
+        help="fsync the audit log before exiting (durable, but slower; file sink only)",
+    )
+    parser.add_argument(
+        "--group-commit",
+        type=int,
+        nargs="?",
+        const=GROUP_COMMIT_EVENTS,
+        default=0,
+        metavar="N",
+        help=(
+            "with --batch/--serve, fsync once per N events (%(const)s if N is "
+            "omitted) or --group-commit-ms, whichever comes first; 0 = off"
+        ),
+    )
+    parser.add_argument(
+        "--group-commit-ms",
+        type=int,
+        default=GROUP_COMMIT_MS,
+        metavar="T",
+        help="longest time an unsynced event may wait for its group-commit fsync",
     )
     parser.add_argument(
         "--usage",
@@ -72,18 +458,149 @@ def main() -> None:
         help="Print usage examples and exit",
     )
 
-    # Parse CLI arguments
-    args = parser.parse_args()
+    return parser
+
+
+# Flags the fast path understands: option -> (attribute, value type or None
+# for a boolean flag)
+_FAST_OPTIONS = {
+    "--kind": ("kind", str),
+    "--message": ("message", str),
+    "--severity": ("severity", str),
+    "--username": ("username", str),
+    "--ip": ("ip", str),
+    "--audit-log": ("audit_log", str),
+    "--batch": ("batch", str),
+    "--serve": ("serve", None),
+    "--sink": ("sink", str),
+    "--epoch-ms": ("epoch_ms", None),
+    "--fsync": ("fsync", None),
+    "--group-commit": ("group_commit", int),
+    "--group-commit-ms": ("group_commit_ms", int),
+    "--usage": ("usage", None),
+}
+
+
+def _default_opts() -> Dict[str, Any]:
+    """Option defaults shared by the fast argv and SOC_FAST parsers."""
+    return {
+        "kind": None,
+        "message": None,
+        "severity": "medium",
+        "username": None,
+        "ip": None,
+        "audit_log": os.getenv("SOC_AUDIT_LOG", "soc_audit_log.jsonl"),
+        "batch": None,
+        "serve": False,
+        "sink": None,
+        "epoch_ms": False,
+        "fsync": False,
+        "group_commit": 0,
+        "group_commit_ms": GROUP_COMMIT_MS,
+        "usage": False,
+    }
+
+
+def args_from_env(environ: Mapping[str, str]) -> "SimpleNamespace | None":
+    """Build the options from SOC_* variables when SOC_FAST=1 is set.
+
+    For scripts that fork the tool once per event: SOC_KIND and SOC_MSG
+    (plus optional SOC_SEVERITY, SOC_USERNAME, SOC_IP and the usual
+    SOC_AUDIT_LOG) replace the flags, so not even argv is parsed. Returns
+    None when SOC_FAST is unset or a required variable is missing.
+    """
+    if environ.get("SOC_FAST") != "1":
+        return None
+    kind, message = environ.get("SOC_KIND"), environ.get("SOC_MSG")
+    if not (kind and message):
+        return None
+    opts = _default_opts()
+    opts["kind"] = kind
+    opts["message"] = message
+    opts["severity"] = environ.get("SOC_SEVERITY") or "medium"
+    opts["username"] = environ.get("SOC_USERNAME")
+    opts["ip"] = environ.get("SOC_IP")
+    return SimpleNamespace(**opts)
+
+
+def parse_args_fast(argv: List[str]) -> "SimpleNamespace | None":
+    """Parse the common one-shot invocation without building an argparse parser.
+
+    Returns None for anything unusual (-h/--help, unknown or abbreviated
+    flags, a missing value, an invalid severity): the caller then re-parses
+    with build_parser(), which produces the usual help and error messages.
+    """
+    opts = _default_opts()
+    it = iter(argv)
+    for tok in it:
+        name, sep, value = tok.partition("=")
+        spec = _FAST_OPTIONS.get(name)
+        if spec is None:
+            return None
+        attr, conv = spec
+        if conv is None:
+            if sep:
+                return None
+            opts[attr] = True
+            continue
+        if not sep:
+            value = next(it, None)
+            if value is None or (value.startswith("-") and value != "-"):
+                return None
+        try:
+            opts[attr] = conv(value)
+        except ValueError:
+            return None
+    if opts["severity"] not in _SEVERITY_SET:
+        return None
+    if opts["group_commit"] < 0 or opts["group_commit_ms"] <= 0:
+        return None
+    return SimpleNamespace(**opts)
+
+
+def main() -> None:
+    # The fast path skips building the argparse parser, the dominant cost
+    # of a one-shot run; the full parser handles help and errors.
+    argv = sys.argv[1:]
+    args = None if argv else args_from_env(os.environ)
+    if args is not None and args.severity not in _SEVERITY_SET:
+        print(f"Error: invalid SOC_SEVERITY {args.severity!r}", file=sys.stderr)
+        sys.exit(2)
+    if args is None:
+        args = parse_args_fast(argv)
+    parser = None
+    if args is None:
+        parser = build_parser()
+        args = parser.parse_args()
+        if args.severity not in _SEVERITY_SET:
+            parser.error(
+                f"argument --severity: invalid choice: {args.severity!r} "
+                f"(choose from {', '.join(map(repr, SEVERITIES))})"
+            )
+        if args.group_commit < 0 or args.group_commit_ms <= 0:
+            parser.error("--group-commit must be >= 0 and --group-commit-ms > 0")
 
     if args.usage:
         print_usage()
-        parser.print_help()
+        (parser or build_parser()).print_help()
         sys.exit(0)
 
+    if args.serve and args.batch is None:
+        args.batch = "-"
+    if args.group_commit and args.batch is None:
+        (parser or build_parser()).error("--group-commit needs --batch or --serve")
+    if args.batch is None:
+        missing = [f"--{name}" for name in ("kind", "message") if not getattr(args, name)]
+        if missing:
+            (parser or build_parser()).error(
+                f"the following arguments are required: {', '.join(missing)}"
+            )
+
     # Build a compact event ready for JSON Lines storage.
     # Use UTC timestamps for consistency across systems.
+    stamp = _epoch_ms if args.epoch_ms else _iso_now
     event: Dict[str, Any] = {
-        "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "ts": stamp(),
         "func": "cli",
         "status": "ok",
         "duration_ms": 0,
@@ -91,6 +608,9 @@ def main() -> None:
         "severity": args.severity,
         "message": args.message,
     }
+    if args.batch is not None:
+        # Only flags actually given act as defaults for the batch lines
+        event = {k: v for k, v in event.items() if v is not None}
     # Attach optional context only when provided to keep entries minimal.
     if args.username:
         event["username"] = args.username
@@ -98,13 +618,84 @@ def main() -> None:
         event["ip"] = args.ip
     # src/dst IP are omitted in the simplified CLI to keep usage minimal.
 
+    sock = None
+    if args.sink:
+        try:
+            sock = open_sink(args.sink)
+        except ValueError as e:
+            (parser or build_parser()).error(str(e))
+        except OSError as e:
+            print(
+                f"Sink '{args.sink}' unreachable ({e}), writing to {args.audit_log}",
+                file=sys.stderr,
+            )
+    if sock is None and args.audit_log.endswith(".zst"):
+        try:
+            import zstandard  # noqa: F401  (checked before the log is created)
+        except ImportError:
+            print("Error: .zst audit logs need the 'zstandard' package", file=sys.stderr)
+            sys.exit(1)
+    target = f"sink '{args.sink}'" if sock is not None else f"audit log '{args.audit_log}'"
+
     try:
-        # Append one compact JSON object per line (JSONL) for easy ingestion.
-        with open(args.audit_log, "a", encoding="utf-8") as f:
-            f.write(json.dumps(event, separators=(",", ":")) + "\n")
-        print(f"Wrote event to {args.audit_log}")
+        sync: Optional[Callable[[], None]] = None
+        finish: Optional[Callable[[], None]] = None
+        if sock is not None:
+            write = partial(_send_all, sock)
+            close = sock.close
+        else:
+            # Append one compact JSON object per line (JSONL) for easy ingestion.
+            # Compression threads only pay off for one-shot batches.
+            threads = -1 if args.batch is not None and not args.serve else 0
+            write, sync, close = open_log_writer(args.audit_log, threads, args.serve)
+            if args.group_commit and args.batch is not None:
+                write, finish = with_group_commit(
+                    write, sync, args.group_commit, args.group_commit_ms
+                )
+        try:
+            if args.batch is not None:
+                max_events = MAX_BATCH_EVENTS
+                if args.serve:
+                    # SIGTERM unwinds through the finally below like Ctrl-C,
+                    # so the descriptor is closed on a normal service stop.
+                    import signal
+
+                    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+                    max_events = 1
+                if args.batch == "-":
+                    count = write_events(
+                        write, iter_batch_events(sys.stdin.buffer, event, stamp), max_events
+                    )
+                else:
+                    with open(args.batch, "rb") as src:
+                        count = write_events(
+                            write, iter_batch_events(src, event, stamp), max_events
+                        )
+            else:
+                line = _dumps_line(event)
+                plain_file = sock is None and not args.audit_log.endswith(".zst")
+                if plain_file and len(line) > ATOMIC_APPEND_MAX:
+                    print(
+                        f"Warning: {len(line)}-byte event exceeds {ATOMIC_APPEND_MAX} bytes; "
+                        "concurrent appends may interleave on some systems",
+                        file=sys.stderr,
+                    )
+                write([line])
+            if args.fsync and sync is not None and finish is None:
+                sync()  # with group commit, finish() below covers --fsync
+        finally:
+            try:
+                if finish is not None:
+                    finish()
+            finally:
+                close()
+        dest = args.sink if sock is not None else args.audit_log
+        if args.batch is not None:
+            print(f"Wrote {count} event(s) to {dest}")
+        else:
+            print(f"Wrote event to {dest}")
     except OSError as e:
-        print(f"Error writing to audit log '{args.audit_log}': {e}")
+        print(f"Error writing to {target}: {e}")
         sys.exit(1)
 
 
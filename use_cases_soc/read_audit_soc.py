@@ -0,0 +1,57 @@
+"""
+MAIN GOAL: Read an ownership-restore audit log back as JSON lines.
+
+main_ownership_restore_soc.py --audit-format msgpack writes a stream of
+MessagePack maps (.mpk) instead of JSONL. This streams such a file (or a
+JSONL one, unchanged) to stdout one JSON object per line, so jq, grep and
+SIEM shippers keep working:
+
+  python read_audit_soc.py soc_audit_log.mpk | jq 'select(.severity=="high")'
+
+Reading .mpk files needs the optional msgpack package.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+
+def iter_audit_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the audit events in `path` as dicts, in file order."""
+    with path.open("rb") as fh:
+        if path.suffix == ".mpk":
+            import msgpack  # optional; only needed for MessagePack logs
+
+            yield from msgpack.Unpacker(fh, raw=False)
+        else:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Print an audit log (.mpk or .jsonl) as JSONL"
+    )
+    parser.add_argument(
+        "path", type=Path, help="Audit log written by main_ownership_restore_soc.py"
+    )
+    args = parser.parse_args()
+
+    if args.path.suffix != ".mpk":  # already JSONL: copy it through
+        with args.path.open("rb") as fh:
+            shutil.copyfileobj(fh, sys.stdout.buffer)
+        return
+    write = sys.stdout.write
+    for record in iter_audit_records(args.path):
+        write(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
+        write("\n")
+
+
+if __name__ == "__main__":
+    main()